@@ -1,5 +1,5 @@
 import streamlit as st
-import time
+from utils.warmup import get_warmup
 
 st.set_page_config(
     page_title="Home",
@@ -17,7 +17,7 @@ with st.sidebar:
     """, unsafe_allow_html=True)
     st.markdown("---")
 
-# Animated progress bar on loading 
+# Progress bar for the background warm-up
 st.markdown("""
 <style>
 .stProgress > div > div > div > div {
@@ -27,12 +27,24 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-progress_text = "Loading application..."
-my_bar = st.progress(0, text=progress_text)
-for pct in range(0, 101, 13):
-    time.sleep(0.3)
-    my_bar.progress(pct, text=f"{progress_text} {pct}%")
-my_bar.empty()
+# Data and models load in a background thread (once per server process)
+# while the landing page is read, so the other pages open from warm caches
+warmup = get_warmup()
+
+
+def warmup_progress():
+    """Poll the warm-up and reload the page once it has finished"""
+    if warmup.done:
+        st.rerun()
+    pct = int(100 * warmup.progress)
+    st.progress(pct, text=f"Loading application... {warmup.current or ''} {pct}%")
+
+
+if not warmup.done:
+    st.fragment(warmup_progress, run_every=0.5)()
+elif warmup.errors:
+    failed = ", ".join(warmup.errors)
+    st.warning(f"Some resources could not be preloaded ({failed}); the pages that need them will show the error.")
 
 st.markdown("""
 <style>        
@@ -1,9 +1,11 @@
 from matplotlib import pyplot as plt
 import streamlit as st
 import pandas as pd
-import altair as alt
-import numpy as np
-from collections import Counter
+import time
+from utils.aggregates import get_aggregates
+from utils.charts import bar_chart, histogram_chart, payload_bytes, show_chart
+from utils.data import get_survey
+from utils.postings import Bitmap, query
 
 st.set_page_config(
     page_title="Descriptive Analysis",
@@ -40,13 +42,212 @@ with st.sidebar:
     """, unsafe_allow_html=True)
     st.markdown("---")
 
-# === Main tabs ===
 st.title("Descriptive Analysis")
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs(["Overview", "Demographic Profile", "Education & Training", "Professional Profile", "Professional Experience", "Technologies Used", "Stack Overflow Usage", "Job Satisfaction & Psychosocial Aspects", "Attitude Towards AI"])
 
 
-# === TAB 1: Overview ===
-with tab1:
+# === DATA ===
+# Charts are served from the prebuilt aggregates (scripts/build_aggregates.py);
+# the shared survey dataset is only loaded when that artifact is missing or stale
+data_note = st.sidebar.empty()
+try:
+    aggregates = get_aggregates()
+except Exception as e:
+    st.error("Error loading data: " + str(e))
+    aggregates = None
+
+
+# === FILTERS ===
+# Filter options come from the unfiltered aggregates; the selected segment is
+# then resolved from the dataset's integer-coded columns and every chart is
+# recomputed for those rows only
+FILTER_LABELS = {
+    "Country": "Country",
+    "Age": "Age",
+    "EdLevel": "Educational level",
+    "RemoteWork": "Work arrangement",
+    "OrgSize_grouped": "Company size",
+    "ICorPM": "Responsibility",
+    "MainBranch": "Main branch",
+}
+
+if aggregates is not None:
+    with st.sidebar:
+        st.markdown("#### 🔎 Filter respondents")
+        if aggregates.can_filter:
+            selections = {
+                column: st.multiselect(label, aggregates[column]["Value"].tolist(), key=f"filter_{column}")
+                for column, label in FILTER_LABELS.items()
+                if aggregates.has(column)
+            }
+            segment_note = st.empty()
+        else:
+            selections = {}
+            st.caption("Filters need the survey dataset in `data/`.")
+
+    if any(selections.values()):
+        total_rows = aggregates.n_rows
+        start = time.perf_counter()
+        aggregates = aggregates.filtered(selections)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        segment_note.caption(
+            f"Segment: {aggregates.n_rows:,} of {total_rows:,} respondents "
+            f"({100 * aggregates.n_rows / total_rows:.1f}%) · selected in {elapsed_ms:.1f} ms"
+        )
+        if aggregates.n_rows == 0:
+            st.warning("No respondents match the selected filters.")
+            st.stop()
+
+
+def chart_counts(name: str, label: str, top: int | None = None,
+                 percent_of_all: bool = False, decimals: int = 1) -> pd.DataFrame | None:
+    """Counts for one chart with a Percent column, or None if the data is unavailable.
+
+    Percent is relative to the rows shown, or to every answer with percent_of_all.
+    """
+    if aggregates is None or not aggregates.has(name):
+        return None
+    data = aggregates[name]
+    shown = data.head(top) if top is not None else data
+    total = data["Count"].sum() if percent_of_all else shown["Count"].sum()
+    return shown.rename(columns={"Value": label}).assign(
+        Percent=(100 * shown["Count"] / total).round(decimals)
+    )
+
+
+def show_histogram(name: str, axis_title: str):
+    """Server-side binned histogram, with a readout of the data sent to the browser"""
+    bins = aggregates[name]
+    show_chart(histogram_chart, bins, axis_title=axis_title)
+
+    n_values = int(bins["Count"].sum())
+    st.caption(
+        f"Chart payload: {len(bins)} bins ({payload_bytes(bins) / 1024:.1f} KB) "
+        f"instead of {n_values:,} raw values (~{n_values * 8 / 1024:,.0f} KB)"
+    )
+
+
+@st.fragment
+def experience_panel(column: str, axis_title: str, key: str):
+    """Histogram or descriptive statistics for one experience column.
+
+    Runs as a fragment, so switching the radio reruns only this panel.
+    """
+    viz_option = st.radio(
+        "Select analysis type:",
+        ["Visual representation", "Descriptive statistics"],
+        index=0,
+        horizontal=True,
+        key=key
+    )
+
+    if viz_option == "Visual representation":
+        show_histogram(column, axis_title)
+
+    else:
+        desc = aggregates[f"{column}_describe"].round(2)
+        desc_df = pd.DataFrame(desc)
+        desc_df.rename(index={
+            "count": "Number of values",
+            "mean": "Mean",
+            "std": "Standard deviation",
+            "min": "Minimum",
+            "25%": "25th percentile",
+            "50%": "Median",
+            "75%": "75th percentile",
+            "max": "Maximum"
+        }, inplace=True)
+
+        desc_df = desc_df.rename(columns={0: column}) if 0 in desc_df.columns else desc_df
+
+        # Convert to styled HTML
+        styled_html = desc_df.to_html(
+            classes="styled-table",
+            border=0,
+            justify="center"
+        )
+
+        st.markdown("""
+        <style>
+        .styled-table {
+            font-family: 'Inter', sans-serif;
+            border-collapse: collapse;
+            margin: 0.5rem 0;
+            font-size: 1.03rem;
+            width: 100%;
+        }
+        .styled-table thead tr {
+            background-color: #f4f4f4;
+            text-align: center;
+            font-weight: bold;
+        }
+        .styled-table th, .styled-table td {
+            border: 1px solid #ddd;
+            padding: 8px 12px;
+            text-align: center;
+        }
+        .styled-table tbody tr:nth-child(even) {
+            background-color: #fcfcfc;
+        }
+        </style>
+        """, unsafe_allow_html=True)
+
+        st.markdown(styled_html, unsafe_allow_html=True)
+
+
+# Multi-select columns offered in the technology query explorer
+QUERY_COLUMNS = {
+    "LanguageHaveWorkedWith": "Language",
+    "DatabaseHaveWorkedWith": "Database",
+    "DevType": "Role",
+    "LearnCode": "Learning",
+    "LearnCodeOnline": "Online resource",
+}
+
+
+@st.fragment
+def query_explorer():
+    """Count respondents by a combination of multi-select answers (AND / OR / NOT).
+
+    Answers are looked up in per-option row bitmaps, so a query is a handful
+    of word-wise operations and a popcount rather than string scans.
+    """
+    choices = [
+        (column, option)
+        for column in QUERY_COLUMNS if aggregates.has(column)
+        for option in aggregates[column]["Value"]
+    ]
+
+    def choice_label(choice):
+        return f"{QUERY_COLUMNS[choice[0]]}: {choice[1]}"
+
+    c1, c2, c3 = st.columns(3)
+    all_of = c1.multiselect("Selected all of", choices, format_func=choice_label, key="query_all_of")
+    any_of = c2.multiselect("…and at least one of", choices, format_func=choice_label, key="query_any_of")
+    none_of = c3.multiselect("…and none of", choices, format_func=choice_label, key="query_none_of")
+    if not (all_of or any_of or none_of):
+        st.caption("Pick options above, e.g. Rust and Go but not Java.")
+        return
+
+    survey = aggregates.dataset if aggregates.dataset is not None else get_survey()
+    for column in {column for column, _ in all_of + any_of + none_of}:
+        survey.postings(column)
+
+    start = time.perf_counter()
+    matches = query(survey, all_of, any_of, none_of)
+    if aggregates.rows is not None:
+        matches = matches & Bitmap.from_rows(aggregates.rows, survey.n_rows)
+    n_matches = matches.count()
+    elapsed_us = (time.perf_counter() - start) * 1e6
+
+    st.metric("Matching respondents", f"{n_matches:,}")
+    st.caption(
+        f"{100 * n_matches / max(aggregates.n_rows, 1):.1f}% of {aggregates.n_rows:,} respondents · "
+        f"evaluated in {elapsed_us:,.0f} µs"
+    )
+
+
+# === SECTION 1: Overview ===
+def render_overview():
     st.markdown("""
     <div style='background:#fff8ea;border-radius:13px;padding:1.2rem 1.4rem 1rem 1.4rem;margin-bottom:1.2rem;
                 box-shadow:0 1px 8px #ffd7a04e; border-left:6px solid #f48024;'>
@@ -77,15 +278,8 @@ with tab1:
     """, unsafe_allow_html=True)
 
 
-# === DATA ===
-try:
-    df = pd.read_csv("data/variabile_preprocesate.csv")
-except Exception as e:
-    st.error("Error loading data: " + str(e))
-    df = pd.DataFrame()
-
-# === TAB 2: Demographic Profile ===
-with tab2:
+# === SECTION 2: Demographic Profile ===
+def render_demographics():
     st.markdown("### 🌍 Distribution of respondents by country – Top 20")
     col1, col2 = st.columns([0.8, 2.2])
 
@@ -101,23 +295,9 @@ with tab2:
 
 
     with col2:
-        if not df.empty and "Country" in df.columns:
-            top_countries = df[df['Country'] != 'Unknown']['Country'].value_counts().head(20).reset_index()
-            top_countries.columns = ["Country", "Count"]
-            top_countries["Percent"] = round(100 * top_countries["Count"] / top_countries["Count"].sum(), 1)
-
-            chart = alt.Chart(top_countries).mark_bar(color="#F48024").encode(
-                x=alt.X("Country:N", sort="-y", title="Country"),
-                y=alt.Y("Count:Q", title="Number of respondents"),
-                tooltip=["Country", "Count", "Percent"]
-            ).properties(width=750, height=380).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter",
-                labelFontSize=12,
-                titleFontSize=13
-            )
-
-            st.altair_chart(chart, use_container_width=True)
+        top_countries = chart_counts("Country", "Country", top=20)
+        if top_countries is not None:
+            show_chart(bar_chart, top_countries, category="Country", axis_title="Country", height=380, vertical=True)
 
     st.markdown("### Distribution of respondents by age groups")
     col1, col2 = st.columns([0.8, 2.2])
@@ -135,40 +315,13 @@ with tab2:
 
 
     with col2:
-        if not df.empty and "Age" in df.columns:
-            # Remove missing values and those with "Unknown" label explicitly
-            df_age = df[(df["Age"].notna()) & (df["Age"] != "Unknown")].copy()
-
-            # If data is numeric, apply binning
-            if pd.api.types.is_numeric_dtype(df_age["Age"]):
-                bins = [0, 17, 24, 34, 44, 54, 64, 100]
-                labels = ["<18", "18-24", "25-34", "35-44", "45-54", "55-64", "65+"]
-                df_age["Age_cat"] = pd.cut(df_age["Age"], bins=bins, labels=labels)
-            else:
-                df_age["Age_cat"] = df_age["Age"]
-
-            # Count only valid values
-            age_counts = df_age["Age_cat"].value_counts().reset_index()
-            age_counts.columns = ["AgeGroup", "Count"]
-            age_counts["AgeGroup"] = age_counts["AgeGroup"].astype(str)
-            age_counts["Percent"] = round(100 * age_counts["Count"] / age_counts["Count"].sum(), 1)
-
-            # Display chart
-            chart = alt.Chart(age_counts).mark_bar(color="#F48024").encode(
-                y=alt.Y("AgeGroup:N", sort="-x", title="Age"),
-                x=alt.X("Count:Q", title="Number of respondents"),
-                tooltip=["AgeGroup", "Count", "Percent"]
-            ).properties(width=750, height=360).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter",
-                labelFontSize=12,
-                titleFontSize=13
-            )
-
-            st.altair_chart(chart, use_container_width=True)
-
-# === TAB 3: Education & Training ===
-with tab3:
+        age_counts = chart_counts("Age", "AgeGroup")
+        if age_counts is not None:
+            show_chart(bar_chart, age_counts, category="AgeGroup", axis_title="Age", height=360)
+
+
+# === SECTION 3: Education & Training ===
+def render_education():
     st.markdown("### 🎓 Distribution by education level")
     col1, col2 = st.columns([0.8, 2.2])
 
@@ -185,20 +338,9 @@ with tab3:
 
 
     with col2:
-        if "EdLevel" in df.columns:
-            ed_counts = df[df['EdLevel'] != 'Unknown']['EdLevel'].value_counts().reset_index()
-            ed_counts.columns = ["Education", "Count"]
-            ed_counts["Percent"] = round(100 * ed_counts["Count"] / ed_counts["Count"].sum(), 1)
-
-            chart = alt.Chart(ed_counts).mark_bar(color="#F48024").encode(
-                y=alt.Y("Education:N", sort="-x", title="Educational level"),
-                x=alt.X("Count:Q", title="Number of respondents"),
-                tooltip=["Education", "Count", "Percent"]
-            ).properties(width=750, height=420).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter"
-            )
-            st.altair_chart(chart, use_container_width=True)
+        ed_counts = chart_counts("EdLevel", "Education")
+        if ed_counts is not None:
+            show_chart(bar_chart, ed_counts, category="Education", axis_title="Educational level", height=420)
 
     # LearnCode
     st.markdown("### 📘 Methods through which respondents learned to code")
@@ -218,20 +360,9 @@ with tab3:
 
 
     with col2:
-        counter = Counter()
-        df['LearnCode'].fillna('').apply(lambda x: counter.update([i.strip() for i in x.split(';') if i.strip()]))
-        learn_df = pd.DataFrame(counter.items(), columns=["Method", "Count"]).sort_values(by="Count", ascending=False)
-        learn_df["Percent"] = round(100 * learn_df["Count"] / learn_df["Count"].sum(), 1)
-
-        chart = alt.Chart(learn_df).mark_bar(color="#F48024").encode(
-            y=alt.Y("Method:N", sort="-x", title="Method"),
-            x=alt.X("Count:Q", title="Number of selections"),
-            tooltip=["Method", "Count", "Percent"]
-        ).properties(width=750, height=420).configure_axis(
-            labelFont="Inter",
-            titleFont="Inter"
-        )
-        st.altair_chart(chart, use_container_width=True)
+        learn_df = chart_counts("LearnCode", "Method")
+        if learn_df is not None:
+            show_chart(bar_chart, learn_df, category="Method", axis_title="Method", value_title="Number of selections", height=420)
 
     # LearnCodeOnline
     st.markdown("### 🌐 Online sources used for learning")
@@ -251,20 +382,9 @@ with tab3:
 
 
     with col2:
-        counter = Counter()
-        df['LearnCodeOnline'].fillna('').apply(lambda x: counter.update([i.strip() for i in x.split(';') if i.strip()]))
-        online_df = pd.DataFrame(counter.items(), columns=["Platform", "Count"]).sort_values(by="Count", ascending=False)
-        online_df["Percent"] = round(100 * online_df["Count"] / online_df["Count"].sum(), 1)
-
-        chart = alt.Chart(online_df).mark_bar(color="#F48024").encode(
-            y=alt.Y("Platform:N", sort="-x", title="Platform"),
-            x=alt.X("Count:Q", title="Number of selections"),
-            tooltip=["Platform", "Count", "Percent"]
-        ).properties(width=750, height=420).configure_axis(
-            labelFont="Inter",
-            titleFont="Inter"
-        )
-        st.altair_chart(chart, use_container_width=True)
+        online_df = chart_counts("LearnCodeOnline", "Platform")
+        if online_df is not None:
+            show_chart(bar_chart, online_df, category="Platform", axis_title="Platform", value_title="Number of selections", height=420)
 
     # TechDoc
     st.markdown("### 📚 Types of technical documentation used")
@@ -284,23 +404,13 @@ with tab3:
 
 
     with col2:
-        counter = Counter()
-        df['TechDoc'].fillna('').apply(lambda x: counter.update([i.strip() for i in x.split(';') if i.strip()]))
-        techdoc_df = pd.DataFrame(counter.items(), columns=["DocType", "Count"]).sort_values(by="Count", ascending=False)
-        techdoc_df["Percent"] = round(100 * techdoc_df["Count"] / techdoc_df["Count"].sum(), 1)
-
-        chart = alt.Chart(techdoc_df).mark_bar(color="#F48024").encode(
-            y=alt.Y("DocType:N", sort="-x", title="Documentation type"),
-            x=alt.X("Count:Q", title="Number of selections"),
-            tooltip=["DocType", "Count", "Percent"]
-        ).properties(width=750, height=420).configure_axis(
-            labelFont="Inter",
-            titleFont="Inter"
-        )
-        st.altair_chart(chart, use_container_width=True)
+        techdoc_df = chart_counts("TechDoc", "DocType")
+        if techdoc_df is not None:
+            show_chart(bar_chart, techdoc_df, category="DocType", axis_title="Documentation type", value_title="Number of selections", height=420)
 
-# === TAB 4: Professional Profile ===
-with tab4:
+
+# === SECTION 4: Professional Profile ===
+def render_professional_profile():
     st.markdown("### 💼 Main branch of activity (MainBranch)")
     col1, col2 = st.columns([0.8, 2.2])
 
@@ -314,20 +424,9 @@ with tab4:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "MainBranch" in df.columns:
-            counts = df["MainBranch"].value_counts().reset_index()
-            counts.columns = ["MainBranch", "Count"]
-            counts["Percent"] = round(100 * counts["Count"] / counts["Count"].sum(), 1)
-
-            chart = alt.Chart(counts).mark_bar(color="#F48024").encode(
-                y=alt.Y("MainBranch:N", sort="-x", title="Main branch"),
-                x=alt.X("Count:Q", title="Number of respondents"),
-                tooltip=["MainBranch", "Count", "Percent"]
-            ).properties(width=750, height=360).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter"
-            )
-            st.altair_chart(chart, use_container_width=True)
+        counts = chart_counts("MainBranch", "MainBranch")
+        if counts is not None:
+            show_chart(bar_chart, counts, category="MainBranch", axis_title="Main branch", height=360)
 
     st.markdown("### 🏠 Work arrangement (RemoteWork)")
     col1, col2 = st.columns([0.8, 2.2])
@@ -342,20 +441,9 @@ with tab4:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "RemoteWork" in df.columns:
-            counts = df["RemoteWork"].value_counts().reset_index()
-            counts.columns = ["RemoteWork", "Count"]
-            counts["Percent"] = round(100 * counts["Count"] / counts["Count"].sum(), 1)
-
-            chart = alt.Chart(counts).mark_bar(color="#F48024").encode(
-                y=alt.Y("RemoteWork:N", sort="-x", title="Work arrangement"),
-                x=alt.X("Count:Q", title="Number of respondents"),
-                tooltip=["RemoteWork", "Count", "Percent"]
-            ).properties(width=750, height=360).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter"
-            )
-            st.altair_chart(chart, use_container_width=True)
+        counts = chart_counts("RemoteWork", "RemoteWork")
+        if counts is not None:
+            show_chart(bar_chart, counts, category="RemoteWork", axis_title="Work arrangement", height=360)
 
     st.markdown("### 👥 Employment status (Employment)")
     col1, col2 = st.columns([0.8, 2.2])
@@ -370,20 +458,9 @@ with tab4:
             """, unsafe_allow_html=True)
 
     with col2:
-        counter = Counter()
-        df['Employment'].fillna('').apply(lambda x: counter.update([i.strip() for i in x.split(';') if i.strip()]))
-        emp_df = pd.DataFrame(counter.items(), columns=["Employment", "Count"]).sort_values(by="Count", ascending=False)
-        emp_df["Percent"] = round(100 * emp_df["Count"] / emp_df["Count"].sum(), 1)
-
-        chart = alt.Chart(emp_df).mark_bar(color="#F48024").encode(
-            y=alt.Y("Employment:N", sort="-x", title="Employment status"),
-            x=alt.X("Count:Q", title="Number of selections"),
-            tooltip=["Employment", "Count", "Percent"]
-        ).properties(width=750, height=420).configure_axis(
-            labelFont="Inter",
-            titleFont="Inter"
-        )
-        st.altair_chart(chart, use_container_width=True)
+        emp_df = chart_counts("Employment", "Employment")
+        if emp_df is not None:
+            show_chart(bar_chart, emp_df, category="Employment", axis_title="Employment status", value_title="Number of selections", height=420)
 
     st.markdown("### 🧑‍💻 Top 20 developer types (DevType)")
     col1, col2 = st.columns([0.8, 2.2])
@@ -398,21 +475,9 @@ with tab4:
             """, unsafe_allow_html=True)
 
     with col2:
-        counter = Counter()
-        df['DevType'].fillna('').apply(lambda x: counter.update([i.strip() for i in x.split(';') if i.strip()]))
-        top20 = counter.most_common(20)
-        dev_df = pd.DataFrame(top20, columns=["DevType", "Count"])
-        dev_df["Percent"] = round(100 * dev_df["Count"] / dev_df["Count"].sum(), 1)
-
-        chart = alt.Chart(dev_df).mark_bar(color="#F48024").encode(
-            y=alt.Y("DevType:N", sort="-x", title="Developer type"),
-            x=alt.X("Count:Q", title="Number of selections"),
-            tooltip=["DevType", "Count", "Percent"]
-        ).properties(width=750, height=420).configure_axis(
-            labelFont="Inter",
-            titleFont="Inter"
-        )
-        st.altair_chart(chart, use_container_width=True)
+        dev_df = chart_counts("DevType", "DevType", top=20)
+        if dev_df is not None:
+            show_chart(bar_chart, dev_df, category="DevType", axis_title="Developer type", value_title="Number of selections", height=420)
 
     st.markdown("### 🏢 Organization size (OrgSize_grouped)")
     col1, col2 = st.columns([0.8, 2.2])
@@ -427,21 +492,9 @@ with tab4:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "OrgSize_grouped" in df.columns:
-            data = df[df["OrgSize_grouped"] != "Unknown"]
-            counts = data["OrgSize_grouped"].value_counts().reset_index()
-            counts.columns = ["OrgSize", "Count"]
-            counts["Percent"] = round(100 * counts["Count"] / counts["Count"].sum(), 1)
-
-            chart = alt.Chart(counts).mark_bar(color="#F48024").encode(
-                y=alt.Y("OrgSize:N", sort="-x", title="Company size"),
-                x=alt.X("Count:Q", title="Number of respondents"),
-                tooltip=["OrgSize", "Count", "Percent"]
-            ).properties(width=750, height=400).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter"
-            )
-            st.altair_chart(chart, use_container_width=True)
+        counts = chart_counts("OrgSize_grouped", "OrgSize")
+        if counts is not None:
+            show_chart(bar_chart, counts, category="OrgSize", axis_title="Company size", height=400)
 
     st.markdown("### 🎯 Type of professional responsibility (ICorPM)")
     col1, col2 = st.columns([0.8, 2.2])
@@ -456,21 +509,9 @@ with tab4:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "ICorPM" in df.columns:
-            data = df[df["ICorPM"] != "Unknown"]
-            counts = data["ICorPM"].value_counts().reset_index()
-            counts.columns = ["RoleType", "Count"]
-            counts["Percent"] = round(100 * counts["Count"] / counts["Count"].sum(), 1)
-
-            chart = alt.Chart(counts).mark_bar(color="#F48024").encode(
-                y=alt.Y("RoleType:N", sort="-x", title="Responsibility"),
-                x=alt.X("Count:Q", title="Number of respondents"),
-                tooltip=["RoleType", "Count", "Percent"]
-            ).properties(width=750, height=400).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter"
-            )
-            st.altair_chart(chart, use_container_width=True)
+        counts = chart_counts("ICorPM", "RoleType")
+        if counts is not None:
+            show_chart(bar_chart, counts, category="RoleType", axis_title="Responsibility", height=400)
 
     st.markdown("### 💰 Annual income distribution (USD)")
 
@@ -486,29 +527,13 @@ with tab4:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "ConvertedCompYearly" in df.columns:
-            # Remove NaN and filter on 1–99 percentile
-            comp = df["ConvertedCompYearly"].dropna()
-            p1, p99 = np.percentile(comp, [1, 99])
-            filtered = comp[(comp >= p1) & (comp <= p99)]
-            hist_df = pd.DataFrame({"Salary": filtered})
-
-            chart = alt.Chart(hist_df).mark_bar(color="#F48024").encode(
-                x=alt.X("Salary:Q", bin=alt.Bin(maxbins=50), title="Annual income (USD)"),
-                y=alt.Y("count():Q", title="Number of respondents"),
-                tooltip=["count()"]
-            ).properties(width=750, height=400).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter",
-                labelFontSize=12,
-                titleFontSize=13
-            )
-
-            st.altair_chart(chart, use_container_width=True)
-
-
-# === TAB 5: Professional Experience ===
-with tab5:
+        # Clipped to the 1–99 percentile range when the bins are built
+        if aggregates is not None and aggregates.has("ConvertedCompYearly"):
+            show_histogram("ConvertedCompYearly", "Annual income (USD)")
+
+
+# === SECTION 5: Professional Experience ===
+def render_experience():
     st.markdown("### 🧮 Years of coding experience (YearsCode)")
 
     col1, col2 = st.columns([0.8, 2.2])
@@ -525,81 +550,10 @@ with tab5:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "YearsCode" in df.columns:
-            years_df = df["YearsCode"].dropna()
-
-            viz_option = st.radio(
-                "Select analysis type:",
-                ["Visual representation", "Descriptive statistics"],
-                index=0,
-                horizontal=True
-            )
-
-            if viz_option == "Visual representation":
-                chart = alt.Chart(pd.DataFrame({"YearsCode": years_df})).mark_bar(color="#F48024").encode(
-                    x=alt.X("YearsCode:Q", bin=alt.Bin(maxbins=40), title="Years of coding experience"),
-                    y=alt.Y("count():Q", title="Number of respondents"),
-                    tooltip=["count()"]
-                ).properties(width=750, height=400).configure_axis(
-                    labelFont="Inter",
-                    titleFont="Inter",
-                    labelFontSize=12,
-                    titleFontSize=13
-                )
-
-                st.altair_chart(chart, use_container_width=True)
-
-            else:
-                desc = years_df.describe().round(2)
-                desc_df = pd.DataFrame(desc)
-                desc_df.rename(index={
-                    "count": "Number of values",
-                    "mean": "Mean",
-                    "std": "Standard deviation",
-                    "min": "Minimum",
-                    "25%": "25th percentile",
-                    "50%": "Median",
-                    "75%": "75th percentile",
-                    "max": "Maximum"
-                }, inplace=True)
-
-                desc_df = desc_df.rename(columns={0: "YearsCode"}) if 0 in desc_df.columns else desc_df
-
-                # Convert to styled HTML
-                styled_html = desc_df.to_html(
-                    classes="styled-table",
-                    border=0,
-                    justify="center"
-                )
-
-                st.markdown("""
-                <style>
-                .styled-table {
-                    font-family: 'Inter', serif;
-                    border-collapse: collapse;
-                    margin: 0.5rem 0;
-                    font-size: 1.03rem;
-                    width: 100%;
-                }
-                .styled-table thead tr {
-                    background-color: #f4f4f4;
-                    text-align: center;
-                    font-weight: bold;
-                }
-                .styled-table th, .styled-table td {
-                    border: 1px solid #ddd;
-                    padding: 4px 4px;
-                    text-align: center;
-                }
-                .styled-table tbody tr:nth-child(even) {
-                    background-color: #fcfcfc;
-                }
-                </style>
-                """, unsafe_allow_html=True)
-
-                st.markdown(styled_html, unsafe_allow_html=True)
-
-        st.markdown("### 🧑‍💼 Total professional experience (WorkExp)")
+        if aggregates is not None and aggregates.has("YearsCode"):
+            experience_panel("YearsCode", "Years of coding experience", "yearscode_radio")
+
+    st.markdown("### 🧑‍💼 Total professional experience (WorkExp)")
 
     col1, col2 = st.columns([0.8, 2.2])
 
@@ -615,83 +569,12 @@ with tab5:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "WorkExp" in df.columns:
-            workexp_df = df["WorkExp"].dropna()
-
-            viz_option = st.radio(
-                "Select analysis type:",
-                ["Visual representation", "Descriptive statistics"],
-                index=0,
-                horizontal=True,
-                key="workexp_radio"
-            )
-
-
-            if viz_option == "Visual representation":
-                chart = alt.Chart(pd.DataFrame({"WorkExp": workexp_df})).mark_bar(color="#F48024").encode(
-                    x=alt.X("WorkExp:Q", bin=alt.Bin(maxbins=40), title="Years of professional experience"),
-                    y=alt.Y("count():Q", title="Number of respondents"),
-                    tooltip=["count()"]
-                ).properties(width=750, height=400).configure_axis(
-                    labelFont="Inter",
-                    titleFont="Inter",
-                    labelFontSize=12,
-                    titleFontSize=13
-                )
-
-                st.altair_chart(chart, use_container_width=True)
-
-            else:
-                desc = workexp_df.describe().round(2)
-                desc_df = pd.DataFrame(desc)
-                desc_df.rename(index={
-                    "count": "Number of values",
-                    "mean": "Mean",
-                    "std": "Standard deviation",
-                    "min": "Minimum",
-                    "25%": "25th percentile",
-                    "50%": "Median",
-                    "75%": "75th percentile",
-                    "max": "Maximum"
-                }, inplace=True)
-
-                desc_df = desc_df.rename(columns={0: "WorkExp"}) if 0 in desc_df.columns else desc_df
-
-                styled_html = desc_df.to_html(
-                    classes="styled-table",
-                    border=0,
-                    justify="center"
-                )
-
-                st.markdown("""
-                <style>
-                .styled-table {
-                    font-family: 'Inter', sans-serif;
-                    border-collapse: collapse;
-                    margin: 0.5rem 0;
-                    font-size: 1.03rem;
-                    width: 100%;
-                }
-                .styled-table thead tr {
-                    background-color: #f4f4f4;
-                    text-align: center;
-                    font-weight: bold;
-                }
-                .styled-table th, .styled-table td {
-                    border: 1px solid #ddd;
-                    padding: 8px 12px;
-                    text-align: center;
-                }
-                .styled-table tbody tr:nth-child(even) {
-                    background-color: #fcfcfc;
-                }
-                </style>
-                """, unsafe_allow_html=True)
-
-                st.markdown(styled_html, unsafe_allow_html=True)
-
-# === TAB 6: Technologies Used ===
-with tab6:
+        if aggregates is not None and aggregates.has("WorkExp"):
+            experience_panel("WorkExp", "Years of professional experience", "workexp_radio")
+
+
+# === SECTION 6: Technologies Used ===
+def render_technologies():
     st.markdown("### 🧑‍💻 Top 20 programming languages used (LanguageHaveWorkedWith)")
 
     col1, col2 = st.columns([0.8, 2.2])
@@ -707,39 +590,9 @@ with tab6:
             """, unsafe_allow_html=True)
 
     with col2:
-        from collections import Counter
-
-        df_lang = df["LanguageHaveWorkedWith"].fillna("")
-        counter = Counter()
-        df_lang.apply(lambda x: counter.update([item.strip() for item in str(x).split(';') if item.strip()]))
-
-        total_options = len(counter)
-        top_n = 20
-        top_items = counter.most_common(top_n)
-
-        lang_df = pd.DataFrame(top_items, columns=["Language", "Count"])
-        total = sum(counter.values())
-        lang_df["Percent"] = round(100 * lang_df["Count"] / total, 1)
-
-        chart = alt.Chart(lang_df).mark_bar(color="#F48024").encode(
-            y=alt.Y("Language:N", sort="-x", title="Programming language", axis=alt.Axis(labelLimit=0, labelOverlap=False)),
-            x=alt.X("Count:Q", title="Number of selections (multi-label)"),
-            tooltip=["Language", "Count", "Percent"]
-        ).properties(
-            width=750,
-            height=420,
-        ).configure_axis(
-            labelFont="Inter",
-            titleFont="Inter",
-            labelFontSize=12,
-            titleFontSize=13
-        ).configure_title(
-            font="Inter",
-            fontSize=14,
-            anchor="start"
-        )
-
-        st.altair_chart(chart, use_container_width=True)
+        lang_df = chart_counts("LanguageHaveWorkedWith", "Language", top=20, percent_of_all=True)
+        if lang_df is not None:
+            show_chart(bar_chart, lang_df, category="Language", axis_title="Programming language", value_title="Number of selections (multi-label)", height=420, full_labels=True)
 
     st.markdown("### 🗄️ Top 20 databases used (DatabaseHaveWorkedWith)")
 
@@ -755,41 +608,19 @@ with tab6:
             """, unsafe_allow_html=True)
 
     with col2:
-        from collections import Counter
-
-        df_db = df["DatabaseHaveWorkedWith"].fillna("")
-        db_counter = Counter()
-        df_db.apply(lambda x: db_counter.update([item.strip() for item in str(x).split(';') if item.strip()]))
-
-        total_options = len(db_counter)
-        top_n = 20
-        db_top_items = db_counter.most_common(top_n)
-
-        db_df = pd.DataFrame(db_top_items, columns=["Database", "Count"])
-        total = sum(db_counter.values())
-        db_df["Percent"] = round(100 * db_df["Count"] / total, 1)
-
-        chart = alt.Chart(db_df).mark_bar(color="#F48024").encode(
-            y=alt.Y("Database:N", sort="-x", title="Database type", axis=alt.Axis(labelLimit=0, labelOverlap=False)),
-            x=alt.X("Count:Q", title="Number of selections (multi-label)"),
-            tooltip=["Database", "Count", "Percent"]
-        ).properties(
-            width=750,
-            height=420,
-        ).configure_axis(
-            labelFont="Inter",
-            titleFont="Inter"
-        ).configure_title(
-            font="Inter",
-            fontSize=14,
-            anchor="start"
-        )
+        db_df = chart_counts("DatabaseHaveWorkedWith", "Database", top=20, percent_of_all=True)
+        if db_df is not None:
+            show_chart(bar_chart, db_df, category="Database", axis_title="Database type", value_title="Number of selections (multi-label)", height=420, full_labels=True)
 
-        st.altair_chart(chart, use_container_width=True)
+    st.markdown("### 🔎 Combine technologies")
+    if aggregates is not None and aggregates.can_filter:
+        query_explorer()
+    else:
+        st.caption("The query explorer needs the survey dataset in `data/`.")
 
-            
-# === TAB 7: Stack Overflow Usage ===
-with tab7:
+
+# === SECTION 7: Stack Overflow Usage ===
+def render_stack_overflow():
     st.markdown("### 🌐 Frequency of Stack Overflow visits (SOVisitFreq)")
 
     col1, col2 = st.columns([0.8, 2.2])
@@ -805,30 +636,9 @@ with tab7:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "SOVisitFreq" in df.columns:
-            visit_df = df["SOVisitFreq"].dropna()
-            visit_df = visit_df[visit_df != "Unknown"]
-            vc = visit_df.value_counts()
-            total = vc.sum()
-
-            bar_df = pd.DataFrame({
-                "SOVisitFreq": vc.index,
-                "Count": vc.values,
-                "Percent": (vc.values / total * 100).round(2)
-            })
-
-            chart = alt.Chart(bar_df).mark_bar(color="#F48024").encode(
-                x=alt.X("Count:Q", title="Number of respondents"),
-                y=alt.Y("SOVisitFreq:N", sort="-x", title="Visit frequency"),
-                tooltip=["SOVisitFreq", "Count", "Percent"]
-            ).properties(width=750, height=400).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter",
-                labelFontSize=12,
-                titleFontSize=13
-            )
-
-            st.altair_chart(chart, use_container_width=True)
+        bar_df = chart_counts("SOVisitFreq", "SOVisitFreq", decimals=2)
+        if bar_df is not None:
+            show_chart(bar_chart, bar_df, category="SOVisitFreq", axis_title="Visit frequency", height=400)
 
     st.markdown("### 👤 Having a Stack Overflow account (SOAccount)")
 
@@ -845,30 +655,11 @@ with tab7:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "SOAccount" in df.columns:
-            account_df = df["SOAccount"].dropna()
-            account_df = account_df[account_df != "Unknown"]
-            vc = account_df.value_counts()
-            total = vc.sum()
-
-            bar_df = pd.DataFrame({
-                "SOAccount": vc.index,
-                "count": vc.values,
-                "percent": (vc.values / total * 100).round(2)
-            })
-
-            chart = alt.Chart(bar_df).mark_bar(color="#F48024").encode(
-                x=alt.X("count:Q", title="count"),
-                y=alt.Y("SOAccount:N", sort="-x", title="SOAccount"),
-                tooltip=["SOAccount", "count", "percent"]
-            ).properties(width=750, height=400).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter",
-                labelFontSize=12,
-                titleFontSize=13
-            )
-
-            st.altair_chart(chart, use_container_width=True)
+        bar_df = chart_counts("SOAccount", "SOAccount", decimals=2)
+        if bar_df is not None:
+            bar_df = bar_df.rename(columns={"Count": "count", "Percent": "percent"})
+
+            show_chart(bar_chart, bar_df, category="SOAccount", axis_title="SOAccount", value="count", value_title="count", height=400)
 
     st.markdown("### 💬 Active participation on Stack Overflow (SOPartFreq)")
 
@@ -885,30 +676,11 @@ with tab7:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "SOPartFreq" in df.columns:
-            part_df = df["SOPartFreq"].dropna()
-            part_df = part_df[part_df != "Unknown"]
-            vc = part_df.value_counts()
-            total = vc.sum()
-
-            bar_df = pd.DataFrame({
-                "SOPartFreq": vc.index,
-                "count": vc.values,
-                "percent": (vc.values / total * 100).round(2)
-            })
-
-            chart = alt.Chart(bar_df).mark_bar(color="#F48024").encode(
-                x=alt.X("count:Q", title="count"),
-                y=alt.Y("SOPartFreq:N", sort="-x", title="SOPartFreq"),
-                tooltip=["SOPartFreq", "count", "percent"]
-            ).properties(width=750, height=400).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter",
-                labelFontSize=12,
-                titleFontSize=13
-            )
-
-            st.altair_chart(chart, use_container_width=True)
+        bar_df = chart_counts("SOPartFreq", "SOPartFreq", decimals=2)
+        if bar_df is not None:
+            bar_df = bar_df.rename(columns={"Count": "count", "Percent": "percent"})
+
+            show_chart(bar_chart, bar_df, category="SOPartFreq", axis_title="SOPartFreq", value="count", value_title="count", height=400)
 
     st.markdown("### 🛠️ How Stack Overflow is used (SOHow)")
 
@@ -924,34 +696,11 @@ with tab7:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "SOHow" in df.columns:
-            from collections import Counter
-
-            sohow_series = df["SOHow"].fillna('')
-            counter = Counter()
-            sohow_series.apply(lambda x: counter.update([item.strip() for item in str(x).split(';') if item.strip()]))
-
-            labels, values = zip(*counter.most_common())
-            total = sum(values)
-
-            bar_df = pd.DataFrame({
-                "SOHow": labels,
-                "count": values,
-                "percent": [round(v / total * 100, 2) for v in values]
-            })
-
-            chart = alt.Chart(bar_df).mark_bar(color="#F48024").encode(
-                x=alt.X("count:Q", title="count"),
-                y=alt.Y("SOHow:N", sort="-x", title="SOHow"),
-                tooltip=["SOHow", "count", "percent"]
-            ).properties(width=750, height=400).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter",
-                labelFontSize=12,
-                titleFontSize=13
-            )
-
-            st.altair_chart(chart, use_container_width=True)
+        bar_df = chart_counts("SOHow", "SOHow", decimals=2)
+        if bar_df is not None:
+            bar_df = bar_df.rename(columns={"Count": "count", "Percent": "percent"})
+
+            show_chart(bar_chart, bar_df, category="SOHow", axis_title="SOHow", value="count", value_title="count", height=400)
 
     st.markdown("### 👥 Perception of belonging to the Stack Overflow community (SOComm)")
 
@@ -968,28 +717,46 @@ with tab7:
             """, unsafe_allow_html=True)
 
     with col2:
-        if "SOComm" in df.columns:
-            comm_df = df["SOComm"].dropna()
-            comm_df = comm_df[comm_df != "Unknown"]
-            vc = comm_df.value_counts()
-            total = vc.sum()
-
-            bar_df = pd.DataFrame({
-                "SOComm": vc.index,
-                "count": vc.values,
-                "percent": (vc.values / total * 100).round(2)
-            })
-
-            chart = alt.Chart(bar_df).mark_bar(color="#F48024").encode(
-                x=alt.X("count:Q", title="count"),
-                y=alt.Y("SOComm:N", sort="-x", title="SOComm"),
-                tooltip=["SOComm", "count", "percent"]
-            ).properties(width=750, height=400).configure_axis(
-                labelFont="Inter",
-                titleFont="Inter",
-                labelFontSize=12,
-                titleFontSize=13
-            )
-
-            st.altair_chart(chart, use_container_width=True)
+        bar_df = chart_counts("SOComm", "SOComm", decimals=2)
+        if bar_df is not None:
+            bar_df = bar_df.rename(columns={"Count": "count", "Percent": "percent"})
+
+            show_chart(bar_chart, bar_df, category="SOComm", axis_title="SOComm", value="count", value_title="count", height=400)
+
 
+def render_placeholder():
+    st.info("This section has no charts yet.")
+
+
+# Only the selected section runs; unopened sections cost nothing
+SECTIONS = {
+    "Overview": render_overview,
+    "Demographic Profile": render_demographics,
+    "Education & Training": render_education,
+    "Professional Profile": render_professional_profile,
+    "Professional Experience": render_experience,
+    "Technologies Used": render_technologies,
+    "Stack Overflow Usage": render_stack_overflow,
+    "Job Satisfaction & Psychosocial Aspects": render_placeholder,
+    "Attitude Towards AI": render_placeholder,
+}
+
+section = st.radio(
+    "Section",
+    list(SECTIONS),
+    horizontal=True,
+    label_visibility="collapsed",
+    key="descriptive_section"
+)
+st.markdown("---")
+SECTIONS[section]()
+
+if aggregates is not None and aggregates.from_artifact:
+    built = pd.Timestamp(aggregates.cube["built_at"], unit="s").strftime("%Y-%m-%d")
+    data_note.caption(f"📦 {aggregates.n_rows:,} respondents · precomputed aggregates (built {built})")
+elif aggregates is not None:
+    survey = aggregates.dataset
+    data_note.caption(
+        f"📦 Dataset: {survey.n_rows:,} rows · {len(survey.loaded_columns)} of {len(survey.columns)} columns loaded · "
+        f"{survey.memory_bytes / 1024**2:,.1f} MB in memory (shared)"
+    )
@@ -1,56 +1,40 @@
 import streamlit as st
-import joblib, numpy as np, pandas as pd
-from catboost import CatBoostRegressor, Pool
-from pathlib import Path
+import io, time
+from collections import Counter
+import numpy as np
+import pandas as pd
+from utils.benchmark import COST_COLUMNS, format_costs, load_costs
+from utils.charts import bar_chart, heatmap_chart, line_chart, show_chart
+from utils.cohorts import load_cohorts
+from utils.models import (
+    SALARY_FILES, load_salary_encoder, load_salary_explainer, load_salary_model, salary_load_report,
+)
+from utils.prediction_cache import get_prediction_cache, show_cache_stats
+from utils.profiles import MAX_UPLOAD_ROWS, read_profiles
+from utils.salary import (
+    AGES, EDLEVELS, PROFILE_COLUMNS, REGIONS, REQUIRED_PROFILE_COLUMNS, language_uplift, predict_salaries,
+    score_profiles, what_if_grid,
+)
 
 
 st.set_page_config(page_title="IT Salary Prediction", layout="wide", page_icon="💰")
 
-@st.cache_resource
-def load_salary_model():
-    """Load salary prediction model and metadata"""
-    MODEL_PATH = Path("models/best_salary_model_catboost.pkl")
-    META_PATH  = Path("models/model_metadata_catboost.pkl")
+# Shared with the Home page warm-up, so this is usually already in memory
+try:
+    model, meta = load_salary_model()
+    encoder = load_salary_encoder()
+    prediction_cache = get_prediction_cache("salary", SALARY_FILES)
+    explainer = load_salary_explainer()
+    explanation_cache = get_prediction_cache("salary_shap", SALARY_FILES)
+except FileNotFoundError:
+    st.error("🔴 Cannot find .pkl files in models/ folder. Check location!")
+    st.stop()
 
-    if not MODEL_PATH.exists() or not META_PATH.exists():
-        st.error("🔴 Cannot find .pkl files in models/ folder. Check location!")
-        st.stop()
-
-    model: CatBoostRegressor = joblib.load(MODEL_PATH)
-    meta  = joblib.load(META_PATH)
-    
-    return model, meta
-
-model, meta = load_salary_model()
+# Survey salary percentiles per cohort; None until scripts/build_cohorts.py has been run
+cohorts = load_cohorts()
 
 feature_columns      = meta["feature_columns"]
-numeric_features     = meta["numeric_features"]
-categorical_features = meta["categorical_features"]
-
-
-EDLEVELS = [
-    "Primary/elementary school",
-    "Secondary school (e.g. American high school, German Realschule or Gymnasium, etc.)",
-    "Some college/university study without earning a degree",
-    "Associate degree (A.A., A.S., etc.)",
-    "Bachelor's degree (B.A., B.S., B.Eng., etc.)",
-    "Master's degree (M.A., M.S., M.Eng., MBA, etc.)",
-    "Professional degree (JD, MD, Ph.D, Ed.D, etc.)",
-    "Something else",
-]
-AGES = [
-    "Under 18 years old", "18-24 years old", "25-34 years old",
-    "35-44 years old", "45-54 years old", "55-64 years old",
-    "65 years or older", "Unknown",
-]
-REGIONS = [
-    'Northern America', 'Western Europe', 'Eastern Europe', 'Northern Europe',
-    'Southern Europe', 'Southern Asia', 'South-eastern Asia', 'Eastern Asia',
-    'Central Asia', 'South America', 'Central America', 'Caribbean',
-    'Northern Africa', 'Western Africa', 'Middle Africa', 'Eastern Africa',
-    'Southern Africa', 'Australia and New Zealand', 'Melanesia', 'Polynesia',
-    'Other',
-]
+
 
 LANGUAGE_COLS = [c for c in feature_columns if c.startswith("Language_")]
 DEVTYPE_COLS  = [c for c in feature_columns if c.startswith("DevType_")]
@@ -64,18 +48,6 @@ VALID_DEVTYPE_LABELS = [
     if "student" not in label.lower() and "other" not in label.lower()
 ]
 
-ED_MAP = {
-    "Primary/elementary school": 0,
-    "Secondary school (e.g. American high school, German Realschule or Gymnasium, etc.)": 1,
-    "Some college/university study without earning a degree": 2,
-    "Associate degree (A.A., A.S., etc.)": 3,
-    "Bachelor's degree (B.A., B.S., B.Eng., etc.)": 4,
-    "Master's degree (M.A., M.S., M.Eng., MBA, etc.)": 5,
-    "Professional degree (JD, MD, Ph.D, Ed.D, etc.)": 6,
-    "Something else": 7,
-}
-
-
 st.title("💰 Salary Prediction for IT Career")
 
 with st.sidebar:
@@ -84,6 +56,18 @@ with st.sidebar:
     st.success("**🏆 Active model:** CatBoost Regressor")
     st.metric("MAE (Test)", f"${meta['test_mae']:,.0f}")
     st.metric("RMSE (Test)", f"${meta['test_rmse']:,.0f}")
+    if salary_load_report:
+        source = "native .cbm" if salary_load_report["source"] == "cbm" else "pickle"
+        st.caption(f"Model loaded from {source} in {salary_load_report['seconds'] * 1000:,.0f} ms")
+
+    # Written by scripts/benchmark_models.py; the exports predict like the pickle, so accuracy is shared
+    model_costs = load_costs()
+    if model_costs.get("salary"):
+        with st.expander("🔍 Model comparison"):
+            costs = pd.DataFrame(model_costs["salary"]).assign(MAE=meta["test_mae"], RMSE=meta["test_rmse"])
+            st.dataframe(format_costs(costs[["Model", "MAE", "RMSE"] + COST_COLUMNS]).round({"MAE": 0, "RMSE": 0}),
+                         use_container_width=True, hide_index=True)
+            st.caption(f"Measured on {model_costs['env']['measured_at']}")
     
     with st.expander("🎯 What do MAE and RMSE mean?"):
         st.markdown("""
@@ -148,30 +132,6 @@ with st.form("salary_form"):
     submitted = st.form_submit_button("💰 Estimate Salary", use_container_width=True)
 
 
-def build_row() -> pd.DataFrame:
-    row = pd.Series(0.0, index=feature_columns, dtype=float)
-
-    row["EdLevel"] = ed
-    row["Age"]     = age
-    row["Region"]  = region
-
-    row["YearsCode"] = years_code
-    row["WorkExp"]   = work_exp
-
-    for col, label in LANGUAGE_LABELS.items():
-        if label.title() in langs_sel:
-            row[col] = 1
-
-    for col, label in DEVTYPE_LABELS.items():
-        row[col] = 1 if label.title() == dev_sel else 0
-
-    row["languages_count"]  = row[LANGUAGE_COLS].sum()
-    row["years_prof_ratio"] = work_exp / max(years_code, 1e-6)
-    row["coding_gap_years"] = max(years_code - work_exp, 0)
-    row["EdLevel_ord"]      = ED_MAP.get(ed, 7)
-
-    return row.to_frame().T
-
 st.markdown("""
 <style>
 .salary-container {
@@ -214,13 +174,23 @@ st.markdown("""
 if submitted:
     try:
         with st.spinner("🔄 Analyzing your profile and calculating salary estimate..."):
-            new_df = build_row()
-            cat_runtime = categorical_features + ["EdLevel"]
-            cat_idx = [new_df.columns.get_loc(c) for c in cat_runtime if c in new_df.columns]
-
-            pred_log = model.predict(Pool(new_df, cat_features=cat_idx))[0]
-            salary = np.expm1(pred_log)
-
+            profile = {
+                "Age": age,
+                "Region": region,
+                "EdLevel": ed,
+                "YearsCode": years_code,
+                "WorkExp": work_exp,
+                "DevType": dev_sel,
+                "Languages": langs_sel,
+            }
+
+            def estimate():
+                new_df = encoder.encode_one(age, region, ed, years_code, work_exp, dev_sel, langs_sel)
+                return float(np.expm1(model.predict(encoder.pool(new_df))[0]))
+
+            # Repeated profiles are answered from the cache without running CatBoost
+            salary = prediction_cache.get_or_compute(profile, estimate)
+            st.session_state["salary_profile"] = profile
 
         st.markdown("---")
         st.success("✅ Salary estimate generated successfully!")
@@ -242,11 +212,193 @@ if submitted:
         </div>
         """, unsafe_allow_html=True)
 
+        cohort = cohorts.cohort(region, dev_sel, work_exp) if cohorts is not None else None
+        if cohort is not None:
+            st.markdown(f"#### 📊 How do you compare? · {cohort.description}")
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("25th percentile", f"${cohort.quantiles[25]:,.0f}")
+            c2.metric("Median", f"${cohort.quantiles[50]:,.0f}")
+            c3.metric("75th percentile", f"${cohort.quantiles[75]:,.0f}")
+            c4.metric("Your estimate ranks at", f"{cohort.percentile_rank(salary):.0f}th percentile")
+            st.caption(f"Actual yearly compensation reported by {cohort.size:,} survey respondents in this cohort.")
+
+        explanation = explanation_cache.get_or_compute(
+            profile,
+            lambda: explainer.explain(encoder.encode_one(age, region, ed, years_code, work_exp, dev_sel, langs_sel)),
+        )
+        with st.expander("🔍 Why this estimate?"):
+            top = explanation.head(12)[["Feature", "Effect %", "Typical effect %"]].round(1)
+            show_chart(bar_chart, top, category="Feature", axis_title="Feature", value="Effect %",
+                       value_title="Effect on the estimate (%)", height=max(250, 28 * len(top)), full_labels=True)
+            st.caption(
+                f"Starting from the model's baseline of ${explainer.baseline_salary:,.0f}, each bar shows how much "
+                "one of your answers moved the estimate up or down. *Typical effect* is the average size of that "
+                "feature's effect across profiles."
+            )
+
     except Exception as e:
         st.error(f"❌ Error generating estimate: {e}")
         st.info("Please try again or contact the administrator.")
 
 
+# === WHAT-IF ===
+WHAT_IF_VALUES = {
+    "YearsCode": list(range(0, 41)),
+    "WorkExp": list(range(0, 41)),
+    "Region": REGIONS,
+    "EdLevel": EDLEVELS,
+    "DevType": VALID_DEVTYPE_LABELS,
+}
+WHAT_IF_LABELS = {
+    "YearsCode": "Years of coding experience",
+    "WorkExp": "Years of professional experience",
+    "Region": "Geographic region",
+    "EdLevel": "Education level",
+    "DevType": "Desired role",
+}
+SALARY_TITLE = "Estimated salary (USD)"
+
+
+@st.fragment
+def what_if_panel(profile: dict):
+    """Salary curve or heatmap over one or two fields of the last submitted profile.
+
+    The whole grid is scored as one batch, so 21 regions x 41 years costs
+    about one model call.
+    """
+    fields = st.multiselect(
+        "Vary one or two fields of your profile",
+        list(WHAT_IF_VALUES),
+        format_func=WHAT_IF_LABELS.get,
+        max_selections=2,
+        key="what_if_fields",
+    )
+    if not fields:
+        st.caption("Pick a field to see how the estimate changes, e.g. region and years of experience.")
+        return
+
+    grid = what_if_grid(profile, {field: WHAT_IF_VALUES[field] for field in fields})
+    start = time.perf_counter()
+    grid["Salary"] = np.round(predict_salaries(model, encoder, grid), 0)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    data = grid[fields + ["Salary"]]
+    if len(fields) == 2:
+        show_chart(heatmap_chart, data, x=fields[0], y=fields[1], value="Salary",
+                   x_title=WHAT_IF_LABELS[fields[0]], y_title=WHAT_IF_LABELS[fields[1]],
+                   value_title=SALARY_TITLE, height=max(300, 22 * len(WHAT_IF_VALUES[fields[1]])))
+    elif fields[0] in ("YearsCode", "WorkExp"):
+        show_chart(line_chart, data, x=fields[0], y="Salary",
+                   x_title=WHAT_IF_LABELS[fields[0]], y_title=SALARY_TITLE)
+    else:
+        show_chart(bar_chart, data, category=fields[0], axis_title=WHAT_IF_LABELS[fields[0]],
+                   value="Salary", value_title=SALARY_TITLE, height=max(300, 24 * len(data)))
+    st.caption(f"{len(grid):,} scenarios scored in one batch in {elapsed_ms:,.0f} ms")
+
+
+UPLIFT_CANDIDATES = [label for label in LANGUAGE_LABELS.values() if label.lower() != "other"]
+
+
+@st.fragment
+def uplift_panel(profile: dict):
+    """Ranked language sets to add, from a beam search over batched predictions"""
+    c1, c2 = st.columns(2)
+    max_added = c1.slider("Languages to add", 1, 3, 2, key="uplift_max_added")
+    beam_width = c2.slider("Branches kept per step", 1, 10, 5, key="uplift_beam_width",
+                           help="More branches explore more combinations at the cost of speed")
+
+    start = time.perf_counter()
+    uplift = language_uplift(model, encoder, profile, UPLIFT_CANDIDATES, max_added, beam_width)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if uplift.empty:
+        st.info("You already know every language the model has a feature for.")
+        return
+
+    st.dataframe(
+        uplift.head(10).style.format({"Salary": "${:,.0f}", "Uplift": "{:+,.0f} $", "Uplift %": "{:+.1f}%"}),
+        use_container_width=True,
+        hide_index=True,
+    )
+    st.caption(f"Searched in {elapsed_ms:,.0f} ms · one batched prediction per added language")
+
+
+if "salary_profile" in st.session_state:
+    st.markdown("---")
+    st.subheader("🔀 What if…")
+    what_if_panel(st.session_state["salary_profile"])
+
+    st.subheader("🚀 Which languages to learn next?")
+    uplift_panel(st.session_state["salary_profile"])
+
+st.markdown("---")
+st.subheader("📂 Batch estimation")
+
+with st.expander("Score a file of profiles", expanded=False):
+    st.markdown(
+        "Upload a CSV or Parquet file with the columns "
+        + ", ".join(f"`{c}`" for c in PROFILE_COLUMNS)
+        + ". `Languages` is optional and `;`-separated (e.g. `Python;SQL`); "
+        "`DevType` is one role per row, written as in the form above or as in the survey. "
+        f"Up to {MAX_UPLOAD_ROWS:,} profiles per file; rows that cannot be scored are skipped and reported."
+    )
+    upload = st.file_uploader("Profiles file", type=["csv", "parquet"], key="batch_upload")
+
+    if upload is not None and st.button("💰 Estimate salaries", key="batch_run"):
+        try:
+            profiles = read_profiles(upload, upload.name, REQUIRED_PROFILE_COLUMNS)
+            progress = st.progress(0, text="Scoring profiles...")
+            output = io.StringIO()
+            preview = []
+            done = 0
+            problems = Counter()
+            start = time.perf_counter()
+            for chunk, salaries, errors in score_profiles(profiles, model, encoder):
+                scored = chunk.assign(EstimatedSalaryUSD=np.round(salaries, 0), Error=errors)
+                problems.update(errors[errors != ""])
+                scored.to_csv(output, index=False, header=(done == 0))
+                if not preview:
+                    preview.append(scored.head(20))
+                done += len(chunk)
+                progress.progress(done / len(profiles), text=f"Scored {done:,} of {len(profiles):,} profiles")
+            elapsed = time.perf_counter() - start
+            progress.empty()
+
+            # Kept in the session so the download click does not re-score the file
+            st.session_state["batch_result"] = {
+                "name": upload.name,
+                "csv": output.getvalue().encode("utf-8"),
+                "preview": preview[0] if preview else None,
+                "rows": done - problems.total(),
+                "skipped": problems.total(),
+                "errors": pd.DataFrame(problems.most_common(10), columns=["Problem", "Profiles"]),
+                "seconds": elapsed,
+            }
+        except Exception as e:
+            st.error(f"❌ Error scoring the file: {e}")
+
+    result = st.session_state.get("batch_result")
+    if upload is not None and result is not None and result["name"] == upload.name:
+        st.success(
+            f"✅ Scored {result['rows']:,} profiles in {result['seconds']:.2f} s "
+            f"({result['rows'] / max(result['seconds'], 1e-9):,.0f} rows/s)"
+        )
+        if result["skipped"]:
+            st.warning(
+                f"⚠️ Skipped {result['skipped']:,} profiles that could not be scored; "
+                "their reason is in the Error column of the download. Most frequent problems:"
+            )
+            st.dataframe(result["errors"], use_container_width=True, hide_index=True)
+        if result["preview"] is not None:
+            st.dataframe(result["preview"], use_container_width=True)
+        st.download_button(
+            "⬇️ Download estimates (CSV)",
+            data=result["csv"],
+            file_name=f"{upload.name.rsplit('.', 1)[0]}_salary_estimates.csv",
+            mime="text/csv",
+        )
+
+show_cache_stats(prediction_cache)
+
 st.markdown("---")
 st.info("🤖 Model: CatBoost Regressor")
 
@@ -2,64 +2,46 @@
 
 import streamlit as st
 import pandas as pd
+import io
 import numpy as np
-import pickle
-import os
-from sklearn.preprocessing import OrdinalEncoder, StandardScaler
+import time
+from utils.charts import bar_chart, heatmap_chart, show_chart
+from utils.benchmark import COST_COLUMNS, format_costs, load_costs
+from utils.models import RECOMMENDER_FILES, load_recommender_metadata, load_recommender_scorer
+from utils.mlp import NumpyMLP
+from utils.prediction_cache import get_prediction_cache, show_cache_stats
+from utils.profiles import MAX_UPLOAD_ROWS, read_profiles
+from utils.recommender import (
+    PROFILE_COLUMNS, TOP_K, CohortRecommendations, OutputLayout, positive_probabilities, role_profiles,
+)
 
 st.set_page_config(page_title="AI Technology Recommendation", layout="wide", page_icon="🤖")
 
 
-@st.cache_resource
-def load_models():
-    """Load all models and data files"""
-    try:
-        model_info = None
-        try:
-            with open("models/model_comparison_results.pkl", "rb") as f:
-                model_info = pickle.load(f)
-        except FileNotFoundError:
-            st.sidebar.warning("Model comparison results not found.")
-        
-        # Load the best model
-        with open("models/recomandare_model_best.pkl", "rb") as f:
-            model = pickle.load(f)
-
-        with open("models/recomandare_encoder.pkl", "rb") as f:
-            encoder = pickle.load(f)
-        
-        scaler = None
-        try:
-            with open("models/recomandare_scaler.pkl", "rb") as f:
-                scaler = pickle.load(f)
-        except FileNotFoundError:
-            pass  # Some models don't need scaling
-
-        with open("models/recomandare_input_cols.pkl", "rb") as f:
-            input_cols = pickle.load(f)
-
-        with open("models/recomandare_output_cols.pkl", "rb") as f:
-            output_cols = pickle.load(f)
-
-        with open("models/recomandare_dropdown_options.pkl", "rb") as f:
-            dropdown_options = pickle.load(f)
-        
-        return model, encoder, scaler, input_cols, output_cols, dropdown_options, model_info
-    
-    except FileNotFoundError as e:
-        st.error(f"Model file not found: {e}")
-        st.info("Make sure all .pkl files are in the current directory")
-        st.info("Try running the multi_model_trainer.py script first.")
-        st.stop()
-    except Exception as e:
-        st.error(f"Error loading models: {e}")
-        st.error("This might be a scikit-learn version compatibility issue.")
-        st.info("Solutions:")
-        st.info("1. Run: pip install --upgrade scikit-learn")
-        st.info("2. Or retrain the model with multi_model_trainer.py")
-        st.stop()
-
-model, encoder, scaler, input_cols, output_cols, dropdown_options, model_info = load_models()
+# Shared with the Home page warm-up, so this is usually already in memory
+try:
+    input_cols, output_cols, dropdown_options, model_info = load_recommender_metadata()
+    # The NumPy export when present, else the scikit-learn model
+    model, input_transformer = load_recommender_scorer()
+except FileNotFoundError as e:
+    st.error(f"Model file not found: {e}")
+    st.info("Make sure all .pkl files are in the current directory")
+    st.info("Try running the multi_model_trainer.py script first.")
+    st.stop()
+except Exception as e:
+    st.error(f"Error loading models: {e}")
+    st.error("This might be a scikit-learn version compatibility issue.")
+    st.info("Solutions:")
+    st.info("1. Run: pip install --upgrade scikit-learn")
+    st.info("2. Or retrain the model with multi_model_trainer.py")
+    st.stop()
+
+if model_info is None:
+    st.sidebar.warning("Model comparison results not found.")
+
+# Entries are probability rows (earlier "recommendation" entries held label/proba tuples)
+prediction_cache = get_prediction_cache("recommendation_scores", RECOMMENDER_FILES)
+output_layout = OutputLayout(output_cols)
 
 
 st.title("🤖 Technology Recommendation for IT Career")
@@ -75,14 +57,25 @@ with st.sidebar:
         # Show model comparison
         with st.expander("🔍 Model comparison"):
             if 'all_results' in model_info:
+                model_costs = load_costs()
                 results_df = pd.DataFrame(model_info['all_results'])
+                if model_costs.get('recommender'):
+                    # Candidates measured without an accuracy row (e.g. the NumPy export) are listed last
+                    results_df = results_df.merge(pd.DataFrame(model_costs['recommender']), on='Model', how='outer')
                 results_df = results_df.sort_values('Jaccard Score', ascending=False)
+                cost_columns = [c for c in COST_COLUMNS if c in results_df.columns]
                 st.dataframe(
-                    results_df[['Model', 'Jaccard Score', 'F1 Micro']].round(4),
+                    format_costs(results_df[['Model', 'Jaccard Score', 'F1 Micro'] + cost_columns].round(4)),
                     use_container_width=True
                 )
+                if cost_columns:
+                    st.caption(f"Costs measured with scripts/benchmark_models.py on {model_costs['env']['measured_at']}")
+                else:
+                    st.caption("Run `python -m scripts.benchmark_models` to add load time, latency and memory.")
     else:
         st.info("Model information not available")
+    if isinstance(model, NumpyMLP):
+        st.caption("Served from the NumPy export (scripts/export_recommender_mlp.py)")
     
     st.markdown("---")
     st.markdown("**🎯 How it works:**")
@@ -173,10 +166,15 @@ st.markdown("""
         """, unsafe_allow_html=True)
 
 
+def run_model(profile: dict):
+    """Probability of every output column for one profile, from one forward pass"""
+    return positive_probabilities(model, input_transformer.transform_one(profile))[0]
+
+
 if submitted:
     try:
         with st.spinner("🔄 Analyzing your profile and generating recommendations..."):
-            input_dict = {
+            profile = {
                 "Age": age,
                 "YearsCode": years_code,
                 "WorkExp": work_exp,
@@ -184,115 +182,14 @@ if submitted:
                 "EdLevel": edlevel,
                 "RemoteWork": remote,
                 "MainBranch_simple": mainbranch,
+                "DevType": devtype,
             }
-
-            for role in dropdown_options["DevType"]:
-                col_name = f"DevType_{role.lower().replace(' ', '_').replace('-', '_').replace('(', '').replace(')', '').replace('.', '')}"
-                input_dict[col_name] = 1 if role == devtype else 0
-
-            input_df = pd.DataFrame([input_dict])
-            
-            categorical_cols = ["Region", "EdLevel", "RemoteWork", "MainBranch_simple"]
-            input_df[categorical_cols] = encoder.transform(input_df[categorical_cols])
-            
-            for col in input_cols:
-                if col not in input_df.columns:
-                    input_df[col] = 0
-            
-            input_df = input_df[input_cols]
-            
-            if scaler is not None and model_info and model_info.get('use_scaled', False):
-                input_df = pd.DataFrame(
-                    scaler.transform(input_df), 
-                    columns=input_df.columns, 
-                    index=input_df.index
-                )
-
-            y_pred = model.predict(input_df)[0]
-            predictions = dict(zip(output_cols, y_pred))
-            
-            languages_with_scores = []
-            ai_tools_with_scores = []
-            
-            try:
-                y_proba_list = model.predict_proba(input_df)
-                
-                for i, (col, pred) in enumerate(predictions.items()):
-                    if pred == 1:  
-                        score = 0.5  
-                        try:
-                            if i < len(y_proba_list):
-                                proba_array = y_proba_list[i][0]  
-                                if len(proba_array) > 1:
-                                    score = proba_array[1]  
-                                else:
-                                    score = proba_array[0] if proba_array[0] > 0.5 else 1 - proba_array[0]
-                        except (IndexError, TypeError):
-                            score = 0.7  
-                        
-                        clean_name = col.replace("Language_", "").replace("AISearchDevHave_", "").replace("_", " ").title()
-                        
-                        if col.startswith("Language_"):
-                            languages_with_scores.append((clean_name, score))
-                        elif col.startswith("AISearchDevHave_"):
-                            ai_tools_with_scores.append((clean_name, score))
-            
-            except AttributeError:
-                for col, pred in predictions.items():
-                    if pred == 1:
-                        base_score = 0.6
-                        if any(tech in col.lower() for tech in ['python', 'javascript', 'sql', 'html', 'css']):
-                            score = base_score + 0.2
-                        else:
-                            score = base_score
-                        
-                        clean_name = col.replace("Language_", "").replace("AISearchDevHave_", "").replace("_", " ").title()
-                        
-                        if col.startswith("Language_"):
-                            languages_with_scores.append((clean_name, score))
-                        elif col.startswith("AISearchDevHave_"):
-                            ai_tools_with_scores.append((clean_name, score))
-            
-            languages_with_scores.sort(key=lambda x: x[1], reverse=True)
-            ai_tools_with_scores.sort(key=lambda x: x[1], reverse=True)
-            
-            languages = [name for name, score in languages_with_scores]
-            ai_tools = [name for name, score in ai_tools_with_scores]
-
-            def normalize_tech_names(lst):
-                """Clean and normalize technology names"""
-                cleaned = set()
-                replacements = {
-                    'Javascript': 'JavaScript',
-                    'Typescript': 'TypeScript',
-                    'Nodejs': 'Node.js',
-                    'Reactjs': 'React.js',
-                    'Vuejs': 'Vue.js',
-                    'Angularjs': 'Angular.js',
-                    'Mysql': 'MySQL',
-                    'Postgresql': 'PostgreSQL',
-                    'Mongodb': 'MongoDB',
-                    'Redis': 'Redis',
-                    'Html Css': 'HTML/CSS',
-                    'Assembly': 'Assembly',
-                    'Bash Shell': 'Bash/Shell',
-                    'Powershell': 'PowerShell'
-                }
-                
-                for item in lst:
-                    clean_item = item.replace("/", " ").replace("_", " ").strip()
-                    
-                    for old, new in replacements.items():
-                        if old.lower() in clean_item.lower():
-                            clean_item = new
-                            break
-                    
-                    cleaned.add(clean_item)
-                
-                return sorted(list(cleaned))
-
-            norm_lang = normalize_tech_names(languages)
-            norm_ai = normalize_tech_names(ai_tools)
+            # Repeated profiles are answered from the cache without running the model
+            proba = prediction_cache.get_or_compute(profile, lambda: run_model(profile))
+            st.session_state["recommendation_profile"] = profile
+            languages_with_scores, ai_tools_with_scores = output_layout.split(proba)
+            norm_lang = sorted(name for name, _ in languages_with_scores)
+            norm_ai = sorted(name for name, _ in ai_tools_with_scores)
 
    
         st.markdown("---")
@@ -352,20 +249,17 @@ if submitted:
                 
                 if languages_with_scores:
                     st.markdown("**🎯 Programming languages - ordered by relevance to your profile:**")
-                    for i, (lang, score) in enumerate(languages_with_scores[:5], 1):
+                    for i, (lang, score) in enumerate(languages_with_scores[:TOP_K], 1):
                         confidence_emoji = "🔥" if score > 0.75 else "⭐" if score > 0.65 else "✨"
                         st.markdown(f"{i}. {confidence_emoji} **{lang}** - Relevance: {score:.1%}")
                 
                 if ai_tools_with_scores:
                     st.markdown("**🤖 AI and development tools - ordered by importance:**")
-                    for i, (tool, score) in enumerate(ai_tools_with_scores[:5], 1):
+                    for i, (tool, score) in enumerate(ai_tools_with_scores[:TOP_K], 1):
                         confidence_emoji = "🔥" if score > 0.75 else "⭐" if score > 0.65 else "✨"
                         st.markdown(f"{i}. {confidence_emoji} **{tool}** - Relevance: {score:.1%}")
                 
-                if any(score != 0.5 and score != 0.6 and score != 0.7 and score != 0.8 for _, score in languages_with_scores + ai_tools_with_scores):
-                    st.info("💡 **Prioritization explanation:** The order is based on probabilities calculated by the Machine Learning model for your specific profile.")
-                else:
-                    st.info("💡 **Prioritization explanation:** The order is based on ML model analysis and technology popularity for your role.")
+                st.info("💡 **Prioritization explanation:** The order is based on probabilities calculated by the Machine Learning model for your specific profile.")
 
     except KeyError as e:
         st.error(f"❌ Error processing data: Column {e} not found in model.")
@@ -374,6 +268,130 @@ if submitted:
         st.error(f"❌ Error generating recommendations: {e}")
         st.info("Please try again or contact the administrator.")
 
+@st.fragment
+def compare_roles(profile: dict):
+    """Role × technology heatmap for the submitted profile, every role scored in one forward pass"""
+    roles = list(dropdown_options["DevType"])
+    c1, c2 = st.columns(2)
+    kind = c1.radio("Show", ["Programming languages", "AI tools"], horizontal=True, key="compare_kind")
+    top = c2.slider("Technologies shown", 5, 30, 15, key="compare_top")
+
+    start = time.perf_counter()
+    proba = positive_probabilities(model, input_transformer.transform(role_profiles(profile, roles)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # The technologies most likely for at least one role, one column per display name
+    mask = output_layout.is_language if kind == "Programming languages" else output_layout.is_ai_tool
+    columns = np.flatnonzero(mask)
+    columns = columns[np.argsort(-proba[:, columns].max(axis=0), kind="stable")]
+    _, first = np.unique(output_layout.names[columns].astype(str), return_index=True)
+    columns = columns[np.sort(first)][:top]
+
+    data = pd.DataFrame({
+        "Role": np.repeat(roles, len(columns)),
+        "Technology": np.tile(output_layout.names[columns].astype(str), len(roles)),
+        "Probability": proba[:, columns].ravel().round(3),
+    })
+    show_chart(heatmap_chart, data, x="Technology", y="Role", value="Probability",
+               x_title=kind, y_title="Role", value_title="Probability", height=max(300, 24 * len(roles)))
+    st.caption(f"{len(roles)} roles scored in one batch in {elapsed_ms:,.1f} ms")
+
+
+if "recommendation_profile" in st.session_state:
+    st.markdown("---")
+    st.subheader("🧭 Compare roles")
+    st.markdown("How the recommendations for your profile change with the role you aim for.")
+    compare_roles(st.session_state["recommendation_profile"])
+
+st.markdown("---")
+st.subheader("📂 Cohort recommendations")
+
+with st.expander("Recommend for a file of profiles", expanded=False):
+    st.markdown(
+        "Upload a CSV or Parquet file with the columns "
+        + ", ".join(f"`{c}`" for c in PROFILE_COLUMNS)
+        + ". Categorical values must be written as in the form above; `DevType` is one role per row, as in the form or the survey. "
+        + f"Up to {MAX_UPLOAD_ROWS:,} profiles per file; rows that cannot be scored are skipped and reported."
+    )
+    upload = st.file_uploader("Profiles file", type=["csv", "parquet"], key="cohort_upload")
+    top_k = st.slider("Recommendations per profile", 1, 10, TOP_K, key="cohort_top_k")
+
+    if upload is not None and st.button("🚀 Recommend for the cohort", key="cohort_run"):
+        try:
+            profiles = read_profiles(upload, upload.name, PROFILE_COLUMNS)
+            cohort = CohortRecommendations(model, input_transformer, output_layout, top_k)
+            progress = st.progress(0, text="Scoring profiles...")
+            output = io.StringIO()
+            preview = None
+            start = time.perf_counter()
+            for scored in cohort.score(profiles):
+                scored.to_csv(output, index=False, header=(preview is None))
+                if preview is None:
+                    preview = scored.head(20)
+                done = cohort.rows + cohort.skipped
+                progress.progress(done / len(profiles), text=f"Scored {done:,} of {len(profiles):,} profiles")
+            elapsed = time.perf_counter() - start
+            progress.empty()
+
+            # Kept in the session so the download clicks do not re-score the file
+            st.session_state["cohort_result"] = {
+                "name": upload.name,
+                "csv": output.getvalue().encode("utf-8"),
+                "preview": preview,
+                "totals": cohort.totals(),
+                "rows": cohort.rows,
+                "skipped": cohort.skipped,
+                "errors": pd.DataFrame(cohort.errors.most_common(10), columns=["Problem", "Profiles"]),
+                "seconds": elapsed,
+            }
+        except Exception as e:
+            st.error(f"❌ Error scoring the file: {e}")
+
+    result = st.session_state.get("cohort_result")
+    if upload is not None and result is not None and result["name"] == upload.name:
+        st.success(
+            f"✅ Scored {result['rows']:,} profiles in {result['seconds']:.2f} s "
+            f"({result['rows'] / max(result['seconds'], 1e-9):,.0f} rows/s)"
+        )
+        if result["skipped"]:
+            st.warning(
+                f"⚠️ Skipped {result['skipped']:,} profiles that could not be scored; "
+                "their reason is in the Error column of the download. Most frequent problems:"
+            )
+            st.dataframe(result["errors"], use_container_width=True, hide_index=True)
+        if result["preview"] is not None:
+            st.dataframe(result["preview"], use_container_width=True)
+
+        totals = result["totals"]
+        c1, c2 = st.columns(2)
+        for column, kind, title in ((c1, "Language", "Programming languages"), (c2, "AI tool", "AI tools")):
+            with column:
+                top = totals[(totals["Kind"] == kind) & (totals["Profiles"] > 0)].head(15)
+                st.markdown(f"**{title} recommended most often**")
+                if top.empty:
+                    st.caption("None recommended for this cohort")
+                else:
+                    show_chart(bar_chart, top[["Technology", "Profiles", "Share %"]].round(1), category="Technology",
+                               axis_title=title, value="Profiles", value_title="Profiles recommended to",
+                               height=max(250, 24 * len(top)))
+
+        stem = upload.name.rsplit('.', 1)[0]
+        d1, d2 = st.columns(2)
+        d1.download_button(
+            "⬇️ Download per-profile recommendations (CSV)",
+            data=result["csv"],
+            file_name=f"{stem}_recommendations.csv",
+            mime="text/csv",
+        )
+        d2.download_button(
+            "⬇️ Download cohort totals (CSV)",
+            data=totals.round(4).to_csv(index=False).encode("utf-8"),
+            file_name=f"{stem}_recommendation_totals.csv",
+            mime="text/csv",
+        )
+
+show_cache_stats(prediction_cache)
+
 st.markdown("---")
 col1 = st.columns(1)
 st.info(f"🤖 Model: Neural Network")
@@ -0,0 +1,128 @@
+"""Measure the cost of the salary and recommendation models for the pages' model comparisons.
+
+Run from the project root on the machine the app is deployed to (numbers
+from different machines are not comparable):
+
+    python -m scripts.benchmark_models
+    python -m scripts.benchmark_models --candidate "Random Forest=models/rf.pkl"
+
+Costs are written to models/model_costs.pkl: one salary row per available
+variant of the model (pickle, native .cbm) and one recommender row per
+candidate whose model file is on disk, plus the NumPy export when present.
+The pages join them with the accuracy in the model metadata by model name;
+the model files and their metadata are never rewritten, so prediction
+caches and the NumPy export stay valid.
+
+Inputs are random form profiles drawn from the fitted encoders' categories
+with a fixed seed (the recommender takes Age as a number of years), and only
+model scoring is timed (feature encoding is the same for every variant).
+"""
+import argparse
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from utils.benchmark import COSTS_PATH, environment, load_pickle, measure_model, save_costs
+from utils.mlp import NumpyMLP
+from utils.models import (
+    RECOMMENDER_DIR, RECOMMENDER_MLP_PATH, SALARY_CBM_PATH, SALARY_META_PATH, SALARY_MODEL_PATH, load_native_model,
+)
+from utils.recommender import InputTransformer, random_profiles as recommender_profiles
+from utils.salary import SalaryEncoder, random_profiles
+
+
+def salary_benchmarks(args) -> list[dict]:
+    encoder = SalaryEncoder(joblib.load(args.meta))
+    features = encoder.encode(random_profiles(encoder, args.batch_rows, args.seed))
+    single, batch = features.iloc[:1], features
+
+    def catboost_predict(model, rows):
+        return model.predict(encoder.pool(rows))
+
+    variants = [
+        ("CatBoost (pickle)", SALARY_MODEL_PATH, lambda: joblib.load(SALARY_MODEL_PATH), catboost_predict),
+        ("CatBoost (native .cbm)", SALARY_CBM_PATH, lambda: load_native_model(SALARY_CBM_PATH), catboost_predict),
+    ]
+    results = []
+    for name, path, load, predict in variants:
+        if not path.exists():
+            print(f"  {name}: {path} not found, skipped")
+            continue
+        results.append(measure_model(name, load, predict, single, batch, path.stat().st_size,
+                                     args.repeats, args.batch_repeats))
+        print(f"  {name}: done")
+    return results
+
+
+def recommender_benchmarks(args, model_info: dict) -> list[dict]:
+    encoder = load_pickle(RECOMMENDER_DIR / "recomandare_encoder.pkl")
+    input_cols = load_pickle(RECOMMENDER_DIR / "recomandare_input_cols.pkl")
+    scaler_path = RECOMMENDER_DIR / "recomandare_scaler.pkl"
+    scaler = load_pickle(scaler_path) if scaler_path.exists() else None
+    roles = list(load_pickle(RECOMMENDER_DIR / "recomandare_dropdown_options.pkl")["DevType"])
+    # The same preprocessing the page uses, so every candidate scores realistic rows
+    transformer = InputTransformer.from_fitted(encoder, scaler, input_cols, roles, model_info.get("use_scaled", False))
+    batch = transformer.transform(recommender_profiles(transformer, args.batch_rows, args.seed))
+
+    active = args.name or model_info.get("best_model_name", "Neural Network")
+    candidates = [(active, RECOMMENDER_DIR / "recomandare_model_best.pkl")]
+    for spec in args.candidate:
+        name, _, path = spec.partition("=")
+        candidates.append((name.strip(), Path(path.strip())))
+
+    results = []
+    for name, path in candidates:
+        if not path.exists():
+            print(f"  {name}: {path} not found, skipped")
+            continue
+        results.append(measure_model(name, lambda: load_pickle(path), lambda model, rows: model.predict_proba(rows),
+                                     batch[:1], batch, path.stat().st_size, args.repeats, args.batch_repeats))
+        print(f"  {name}: done")
+
+    if RECOMMENDER_MLP_PATH.exists():
+        def load_export():
+            with np.load(RECOMMENDER_MLP_PATH) as arrays:
+                return NumpyMLP.from_arrays(arrays, "mlp_")
+
+        name = f"{active} (NumPy)"
+        results.append(measure_model(name, load_export, lambda model, rows: model.predict_proba(rows),
+                                     batch[:1], batch, RECOMMENDER_MLP_PATH.stat().st_size,
+                                     args.repeats, args.batch_repeats))
+        print(f"  {name}: done")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meta", type=Path, default=SALARY_META_PATH)
+    parser.add_argument("--comparison", type=Path, default=RECOMMENDER_DIR / "model_comparison_results.pkl")
+    parser.add_argument("--out", type=Path, default=COSTS_PATH)
+    parser.add_argument("--name", help="name of the active recommender in the comparison (default: its best_model_name)")
+    parser.add_argument("--candidate", action="append", default=[], metavar="NAME=PATH",
+                        help="another recommender candidate to measure (repeatable)")
+    parser.add_argument("--repeats", type=int, default=200, help="single-row predictions timed per model")
+    parser.add_argument("--batch-rows", type=int, default=10_000)
+    parser.add_argument("--batch-repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    costs = {"env": environment()}
+
+    print("Salary model")
+    costs["salary"] = salary_benchmarks(args)
+    print(pd.DataFrame(costs["salary"]).round(2).to_string(index=False))
+
+    if args.comparison.exists():
+        print("Recommendation model")
+        model_info = load_pickle(args.comparison)
+        costs["recommender"] = recommender_benchmarks(args, model_info)
+        print(pd.DataFrame(costs["recommender"]).round(4).to_string(index=False))
+    else:
+        print(f"{args.comparison} not found, recommender not measured")
+
+    print(f"Wrote {save_costs(costs, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
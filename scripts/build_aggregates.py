@@ -0,0 +1,34 @@
+"""Precompute every chart aggregate of the Descriptive Analysis page.
+
+Run from the project root after the dataset changes:
+
+    python -m scripts.build_aggregates
+"""
+import argparse
+import time
+from pathlib import Path
+
+from utils.aggregates import AGGREGATES_PATH, build_aggregates, save_aggregates
+from utils.data import ARROW_PATH, DATA_PATH, open_survey
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, default=DATA_PATH)
+    parser.add_argument("--arrow", type=Path, default=ARROW_PATH)
+    parser.add_argument("--out", type=Path, default=AGGREGATES_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    dataset = open_survey(args.csv, args.arrow)
+    cube = build_aggregates(dataset, args.csv)
+    path = save_aggregates(cube, args.out)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Wrote {len(cube['aggregates'])} aggregates over {dataset.n_rows:,} rows to {path} "
+        f"({path.stat().st_size / 1024:,.1f} KB) in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Precompute the cohort salary cube behind the salary page's "how do you compare" panel.
+
+Run from the project root after the dataset changes:
+
+    python -m scripts.build_cohorts
+"""
+import argparse
+import time
+from pathlib import Path
+
+from utils.cohorts import COHORTS_PATH, build_cohorts, save_cohorts
+from utils.data import ARROW_PATH, DATA_PATH, open_survey
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, default=DATA_PATH)
+    parser.add_argument("--arrow", type=Path, default=ARROW_PATH)
+    parser.add_argument("--out", type=Path, default=COHORTS_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cube = build_cohorts(open_survey(args.csv, args.arrow))
+    path = save_cohorts(cube, args.out)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Wrote {len(cube['offsets']) - 1:,} cohorts ({len(cube['regions'])} regions × {len(cube['roles'])} roles) "
+        f"over {cube['n_rows']:,} salaries to {path} ({path.stat().st_size / 1024:,.1f} KB) in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
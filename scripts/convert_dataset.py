@@ -0,0 +1,27 @@
+"""Convert the preprocessed survey CSV into a memory-mappable Arrow IPC file.
+
+Run from the project root:
+
+    python -m scripts.convert_dataset
+"""
+import argparse
+import time
+from pathlib import Path
+
+from utils.data import ARROW_PATH, DATA_PATH, convert_to_arrow
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, default=DATA_PATH)
+    parser.add_argument("--out", type=Path, default=ARROW_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = convert_to_arrow(args.csv, args.out)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {path} ({path.stat().st_size / 1024**2:,.1f} MB) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
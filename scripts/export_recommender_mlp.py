@@ -0,0 +1,92 @@
+"""Export the MLP recommender and its preprocessing to NumPy arrays, checked against scikit-learn.
+
+Run from the project root after retraining the recommender:
+
+    python -m scripts.export_recommender_mlp
+
+The export is only written when, on a sample of random profiles, the
+compiled preprocessing matches encoder/scaler.transform and the NumPy
+forward pass matches predict_proba within the tolerance.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.benchmark import best_time, load_pickle
+from utils.mlp import NumpyMLP
+from utils.models import RECOMMENDER_DIR, RECOMMENDER_MLP_PATH, save_recommender_export
+from utils.recommender import NUMERIC_INPUTS, InputTransformer, devtype_column, positive_probabilities, random_profiles
+
+
+def sklearn_inputs(profiles: pd.DataFrame, encoder, scaler, input_cols, roles, use_scaled: bool) -> pd.DataFrame:
+    """Model inputs built the way the page used to: DataFrames, encoder.transform, scaler.transform"""
+    frame = profiles[NUMERIC_INPUTS].astype(float)
+    categorical = list(encoder.feature_names_in_)
+    frame[categorical] = encoder.transform(profiles[categorical])
+    for role in roles:
+        frame[devtype_column(role)] = (profiles["DevType"] == role).astype(float)
+    frame = frame.reindex(columns=input_cols, fill_value=0)
+    if scaler is not None and use_scaled:
+        frame = pd.DataFrame(scaler.transform(frame), columns=input_cols)
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, default=RECOMMENDER_MLP_PATH)
+    parser.add_argument("--check-rows", type=int, default=10_000)
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="max abs difference in probability")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = load_pickle(RECOMMENDER_DIR / "recomandare_model_best.pkl")
+    encoder = load_pickle(RECOMMENDER_DIR / "recomandare_encoder.pkl")
+    scaler_path = RECOMMENDER_DIR / "recomandare_scaler.pkl"
+    scaler = load_pickle(scaler_path) if scaler_path.exists() else None
+    input_cols = load_pickle(RECOMMENDER_DIR / "recomandare_input_cols.pkl")
+    dropdown_options = load_pickle(RECOMMENDER_DIR / "recomandare_dropdown_options.pkl")
+    comparison_path = RECOMMENDER_DIR / "model_comparison_results.pkl"
+    model_info = load_pickle(comparison_path) if comparison_path.exists() else None
+    use_scaled = bool(model_info and model_info.get("use_scaled", False))
+
+    roles = list(dropdown_options["DevType"])
+    transformer = InputTransformer.from_fitted(encoder, scaler, input_cols, roles, use_scaled)
+    mlp = NumpyMLP.from_sklearn(model)
+
+    # Sampled from the encoder's categories: the dropdowns also offer values it never saw (e.g. Polynesia)
+    profiles = random_profiles(transformer, args.check_rows, args.seed)
+    reference = sklearn_inputs(profiles, encoder, scaler, input_cols, roles, use_scaled)
+    compiled = transformer.transform(profiles)
+    input_error = float(np.max(np.abs(reference.to_numpy() - compiled)))
+    if input_error > args.tolerance:
+        raise SystemExit(f"Compiled inputs differ from the scikit-learn preprocessing by up to {input_error:.3g}; nothing written")
+
+    expected = positive_probabilities(model, reference)
+    actual = mlp.predict_proba(compiled)
+    error = float(np.max(np.abs(expected - actual)))
+    if error > args.tolerance:
+        raise SystemExit(f"NumPy MLP differs from predict_proba by up to {error:.3g} (tolerance {args.tolerance:g}); nothing written")
+
+    path = save_recommender_export(mlp, transformer, args.out)
+    print(f"Wrote {len(mlp.coefs)} layers × {mlp.coefs[0].shape[0]} networks to {path} ({path.stat().st_size / 1024:,.1f} KB)")
+    print(f"Max abs difference on {len(profiles):,} profiles: inputs {input_error:.3g}, probabilities {error:.3g}")
+
+    profile = profiles.iloc[0].to_dict()
+    timings = {
+        "scikit-learn, one profile": best_time(lambda: positive_probabilities(
+            model, sklearn_inputs(profiles.iloc[:1], encoder, scaler, input_cols, roles, use_scaled)), args.repeat),
+        "NumPy, one profile": best_time(lambda: mlp.predict_proba(transformer.transform_one(profile)), args.repeat),
+        f"scikit-learn, {len(profiles):,} profiles": best_time(lambda: positive_probabilities(
+            model, sklearn_inputs(profiles, encoder, scaler, input_cols, roles, use_scaled)), 3),
+        f"NumPy, {len(profiles):,} profiles": best_time(lambda: mlp.predict_proba(transformer.transform(profiles)), 3),
+    }
+    print("Best times, preprocessing included:")
+    for name, seconds in timings.items():
+        print(f"  {name:<32}{seconds * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
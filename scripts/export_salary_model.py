@@ -0,0 +1,59 @@
+"""Export the CatBoost salary model to CatBoost's native .cbm format and compare load times.
+
+Run from the project root after retraining the model:
+
+    python -m scripts.export_salary_model
+
+The .cbm file is written next to the target first and only moved into
+place once it predicts like the pickle on a batch of random profiles, so
+a failed check never leaves a file the app would prefer over the pickle.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from utils.benchmark import best_time
+from utils.models import SALARY_CBM_PATH, SALARY_META_PATH, SALARY_MODEL_PATH, export_native_model, load_native_model
+from utils.salary import SalaryEncoder, random_profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", type=Path, default=SALARY_MODEL_PATH)
+    parser.add_argument("--meta", type=Path, default=SALARY_META_PATH)
+    parser.add_argument("--out", type=Path, default=SALARY_CBM_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check-rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    tmp_path = export_native_model(model, args.out.with_name(args.out.stem + ".check.cbm"))
+
+    # The export must predict exactly like the pickle
+    encoder = SalaryEncoder(joblib.load(args.meta))
+    pool = encoder.pool(encoder.encode(random_profiles(encoder, args.check_rows, args.seed)))
+    error = float(np.max(np.abs(model.predict(pool) - load_native_model(tmp_path).predict(pool))))
+    if error > 1e-9:
+        tmp_path.unlink()
+        raise SystemExit(f"Exported model differs from the pickle by up to {error:.3g} (log salary); nothing written")
+    os.replace(tmp_path, args.out)
+    path = args.out
+
+    timings = {
+        "pickle (joblib.load)": best_time(lambda: joblib.load(args.model), args.repeat),
+        "native .cbm file": best_time(lambda: load_native_model(path), args.repeat),
+        "native .cbm from memory": best_time(lambda: load_native_model(path, from_buffer=True), args.repeat),
+    }
+    print(f"Wrote {path} ({path.stat().st_size / 1024**2:,.1f} MB, pickle {args.model.stat().st_size / 1024**2:,.1f} MB)")
+    print(f"Predictions on {args.check_rows:,} random profiles match the pickle (max difference {error:.3g})")
+    print(f"Best of {args.repeat} loads:")
+    for name, seconds in timings.items():
+        print(f"  {name:<26}{seconds * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
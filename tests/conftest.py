@@ -0,0 +1,27 @@
+import pytest
+
+from utils.benchmark import load_pickle as unpickle
+from utils.models import RECOMMENDER_DIR
+
+
+def load_pickle(name: str, optional: bool = False):
+    """A recommender pickle; skips the test when it is missing, or returns None if `optional`"""
+    path = RECOMMENDER_DIR / name
+    if not path.exists():
+        if optional:
+            return None
+        pytest.skip(f"{path} not found")
+    return unpickle(path)
+
+
+@pytest.fixture(scope="session")
+def fitted_recommender():
+    """(model, encoder, scaler, input_cols, roles, use_scaled) as trained"""
+    pytest.importorskip("sklearn")
+    model = load_pickle("recomandare_model_best.pkl")
+    encoder = load_pickle("recomandare_encoder.pkl")
+    scaler = load_pickle("recomandare_scaler.pkl", optional=True)
+    input_cols = list(load_pickle("recomandare_input_cols.pkl"))
+    roles = list(load_pickle("recomandare_dropdown_options.pkl")["DevType"])
+    model_info = load_pickle("model_comparison_results.pkl", optional=True) or {}
+    return model, encoder, scaler, input_cols, roles, model_info.get("use_scaled", False)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from utils.cohorts import ANY, EXPERIENCE_LABELS, MIN_COHORT, QUANTILES, CohortCube
+from utils.salary import label_key
+
+
+REGIONS = ["Western Europe", ANY]
+ROLES = [label_key("Developer, back-end"), ANY]
+
+
+@pytest.fixture
+def cube() -> CohortCube:
+    """Every cell of the 5-9 years bucket holds MIN_COHORT copies of its own salary"""
+    bucket = EXPERIENCE_LABELS.index("5-9 years")
+    cell_salaries = {
+        (0, 0): 50_000.0,   # back-end developers in Western Europe
+        (0, 1): 60_000.0,   # all roles in Western Europe
+        (1, 0): 70_000.0,   # back-end developers worldwide
+        (1, 1): 80_000.0,   # all respondents
+    }
+    n_cells = len(REGIONS) * len(ROLES) * len(EXPERIENCE_LABELS)
+    sizes = np.zeros(n_cells, dtype=int)
+    salaries, quantiles = [], np.full((n_cells, len(QUANTILES)), np.nan, dtype=np.float32)
+    for cell in range(n_cells):
+        region, rest = divmod(cell, len(ROLES) * len(EXPERIENCE_LABELS))
+        role, cell_bucket = divmod(rest, len(EXPERIENCE_LABELS))
+        if cell_bucket == bucket:
+            salary = cell_salaries[region, role]
+            sizes[cell] = MIN_COHORT
+            salaries.append(np.full(MIN_COHORT, salary, dtype=np.float32))
+            quantiles[cell] = salary
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    return CohortCube(REGIONS, ROLES, np.concatenate(salaries), offsets, quantiles)
+
+
+def test_known_region_and_role(cube):
+    cohort = cube.cohort("Western Europe", "Developer, back-end", 6)
+    assert cohort.description == "Developer, back-end in Western Europe, 5-9 years"
+    assert cohort.quantiles[50] == 50_000
+
+
+def test_unseen_region_uses_the_role_worldwide(cube):
+    cohort = cube.cohort("Polynesia", "Developer, back-end", 6)
+    assert cohort.description == "Developer, back-end worldwide, 5-9 years"
+    assert cohort.quantiles[50] == 70_000
+
+
+def test_unseen_role_uses_all_roles_in_the_region(cube):
+    cohort = cube.cohort("Western Europe", "Engineering Manager", 6)
+    assert cohort.description == "All roles in Western Europe, 5-9 years"
+    assert cohort.quantiles[50] == 60_000
+
+
+def test_unseen_region_and_role_use_all_respondents(cube):
+    cohort = cube.cohort("Polynesia", "Engineering Manager", 6)
+    assert cohort.description == "All respondents, 5-9 years"
+    assert cohort.quantiles[50] == 80_000
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.preprocessing import OrdinalEncoder
+
+from utils.recommender import NUMERIC_INPUTS, InputTransformer, devtype_column, random_profiles
+
+
+def pipeline_inputs(profiles: pd.DataFrame, encoder, scaler, input_cols, roles, use_scaled: bool) -> np.ndarray:
+    """Model inputs built the original way: encoder.transform, DevType one-hot, scaler.transform"""
+    frame = profiles[NUMERIC_INPUTS].astype(float)
+    categorical = list(encoder.feature_names_in_)
+    frame[categorical] = encoder.transform(profiles[categorical])
+    for role in roles:
+        frame[devtype_column(role)] = (profiles["DevType"] == role).astype(float)
+    frame = frame.reindex(columns=input_cols, fill_value=0)
+    if scaler is not None and use_scaled:
+        return scaler.transform(frame)
+    return frame.to_numpy()
+
+
+@pytest.fixture(scope="module")
+def pipeline(fitted_recommender):
+    _, encoder, scaler, input_cols, roles, use_scaled = fitted_recommender
+    return encoder, scaler, input_cols, roles, use_scaled
+
+
+def test_transform_matches_pipeline(pipeline):
+    transformer = InputTransformer.from_fitted(*pipeline)
+    profiles = random_profiles(transformer, 1_000, seed=0)
+    np.testing.assert_allclose(transformer.transform(profiles), pipeline_inputs(profiles, *pipeline), rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(
+        transformer.transform_one(profiles.iloc[0].to_dict()), pipeline_inputs(profiles.head(1), *pipeline),
+        rtol=1e-5, atol=1e-5,
+    )
+
+
+def test_nan_numerics_are_read_as_zero(pipeline):
+    transformer = InputTransformer.from_fitted(*pipeline)
+    profiles = random_profiles(transformer, 50, seed=1)
+    profiles.loc[::2, "YearsCode"] = np.nan
+    profiles.loc[::3, "WorkExp"] = np.nan
+
+    features = transformer.transform(profiles)
+    assert np.isfinite(features).all()
+    assert (transformer.row_errors(profiles) == "").all()
+    np.testing.assert_allclose(features, pipeline_inputs(profiles.fillna(0), *pipeline), rtol=1e-5, atol=1e-5)
+
+
+def test_unknown_category_raises_like_the_encoder(pipeline):
+    encoder = pipeline[0]
+    transformer = InputTransformer.from_fitted(*pipeline)
+    profiles = random_profiles(transformer, 10, seed=2)
+    column = encoder.feature_names_in_[0]
+    profiles.loc[3, column] = "Atlantis"
+
+    with pytest.raises(ValueError):
+        pipeline_inputs(profiles, *pipeline)
+    with pytest.raises(ValueError, match="Atlantis"):
+        transformer.transform(profiles)
+    errors = transformer.row_errors(profiles)
+    assert errors[3] == f"unknown {column} 'Atlantis'"
+    assert (np.delete(errors, 3) == "").all()
+
+
+def test_unknown_category_uses_the_encoded_value(pipeline):
+    encoder, *rest = pipeline
+    transformer = InputTransformer.from_fitted(*pipeline)
+    profiles = random_profiles(transformer, 200, seed=3)
+    column = encoder.feature_names_in_[0]
+    profiles.loc[::7, column] = "Atlantis"
+
+    lenient = OrdinalEncoder(
+        categories=encoder.categories_, handle_unknown="use_encoded_value", unknown_value=-1,
+    ).fit(profiles[encoder.feature_names_in_])
+    transformer = InputTransformer.from_fitted(lenient, *rest)
+    assert (transformer.row_errors(profiles) == "").all()
+    np.testing.assert_allclose(
+        transformer.transform(profiles), pipeline_inputs(profiles, lenient, *rest), rtol=1e-5, atol=1e-5,
+    )
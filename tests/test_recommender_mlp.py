@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from utils.mlp import NumpyMLP
+from utils.recommender import InputTransformer, positive_probabilities, random_profiles
+
+
+@pytest.fixture(scope="module")
+def recommender(fitted_recommender):
+    model, encoder, scaler, input_cols, roles, use_scaled = fitted_recommender
+    return model, InputTransformer.from_fitted(encoder, scaler, input_cols, roles, use_scaled)
+
+
+def test_numpy_mlp_matches_predict_proba(recommender):
+    model, transformer = recommender
+    features = transformer.transform(random_profiles(transformer, 500, seed=0))
+    expected = positive_probabilities(model, features)
+    np.testing.assert_allclose(NumpyMLP.from_sklearn(model).predict_proba(features), expected, atol=1e-5)
+
+
+def test_export_round_trip(recommender, tmp_path):
+    model, transformer = recommender
+    mlp = NumpyMLP.from_sklearn(model)
+    np.savez(tmp_path / "export.npz", **mlp.arrays("mlp_"), **transformer.arrays("input_"))
+    with np.load(tmp_path / "export.npz") as arrays:
+        loaded_mlp = NumpyMLP.from_arrays(arrays, "mlp_")
+        loaded_transformer = InputTransformer.from_arrays(arrays, "input_")
+
+    profiles = random_profiles(transformer, 200, seed=1)
+    np.testing.assert_array_equal(loaded_transformer.transform(profiles), transformer.transform(profiles))
+    features = transformer.transform(profiles)
+    np.testing.assert_array_equal(loaded_mlp.predict_proba(features), mlp.predict_proba(features))
@@ -0,0 +1 @@
+"""Shared helpers for the Streamlit pages and the offline build scripts."""
@@ -0,0 +1,254 @@
+import hashlib
+import pickle
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from utils.charts import histogram_bins
+from utils.data import DATA_PATH, SurveyDataset, file_signature, get_survey, survey_source
+
+
+AGGREGATES_PATH = Path("models/descriptive_aggregates.pkl")
+# Bump whenever the specs or the shape of a stored aggregate change
+AGGREGATES_VERSION = 3
+
+
+@dataclass(frozen=True)
+class AggregateSpec:
+    """How one chart's data is derived from a survey column.
+
+    kind is one of:
+    - "value_counts": counts per answer of a single-choice column
+    - "options": counts per option of a semicolon-delimited column
+    - "histogram": NumPy-binned counts of a numeric column, optionally
+      clipped to a percentile range first
+    - "describe": pandas describe() of a numeric column
+    """
+    kind: str
+    column: str
+    exclude: tuple = ()
+    clip: tuple | None = None
+    maxbins: int = 40
+    bins: tuple | None = None
+    labels: tuple | None = None
+
+
+AGGREGATE_SPECS = {
+    "Country": AggregateSpec("value_counts", "Country", exclude=("Unknown",)),
+    "Age": AggregateSpec(
+        "value_counts", "Age", exclude=("Unknown",),
+        bins=(0, 17, 24, 34, 44, 54, 64, 100),
+        labels=("<18", "18-24", "25-34", "35-44", "45-54", "55-64", "65+"),
+    ),
+    "EdLevel": AggregateSpec("value_counts", "EdLevel", exclude=("Unknown",)),
+    "LearnCode": AggregateSpec("options", "LearnCode"),
+    "LearnCodeOnline": AggregateSpec("options", "LearnCodeOnline"),
+    "TechDoc": AggregateSpec("options", "TechDoc"),
+    "MainBranch": AggregateSpec("value_counts", "MainBranch"),
+    "RemoteWork": AggregateSpec("value_counts", "RemoteWork"),
+    "Employment": AggregateSpec("options", "Employment"),
+    "DevType": AggregateSpec("options", "DevType"),
+    "OrgSize_grouped": AggregateSpec("value_counts", "OrgSize_grouped", exclude=("Unknown",)),
+    "ICorPM": AggregateSpec("value_counts", "ICorPM", exclude=("Unknown",)),
+    "ConvertedCompYearly": AggregateSpec("histogram", "ConvertedCompYearly", clip=(1, 99), maxbins=50),
+    "YearsCode": AggregateSpec("histogram", "YearsCode"),
+    "YearsCode_describe": AggregateSpec("describe", "YearsCode"),
+    "WorkExp": AggregateSpec("histogram", "WorkExp"),
+    "WorkExp_describe": AggregateSpec("describe", "WorkExp"),
+    "LanguageHaveWorkedWith": AggregateSpec("options", "LanguageHaveWorkedWith"),
+    "DatabaseHaveWorkedWith": AggregateSpec("options", "DatabaseHaveWorkedWith"),
+    "SOVisitFreq": AggregateSpec("value_counts", "SOVisitFreq", exclude=("Unknown",)),
+    "SOAccount": AggregateSpec("value_counts", "SOAccount", exclude=("Unknown",)),
+    "SOPartFreq": AggregateSpec("value_counts", "SOPartFreq", exclude=("Unknown",)),
+    "SOHow": AggregateSpec("options", "SOHow"),
+    "SOComm": AggregateSpec("value_counts", "SOComm", exclude=("Unknown",)),
+}
+
+
+# Single-choice columns the Descriptive Analysis page can filter on
+FILTER_COLUMNS = ("Country", "Age", "EdLevel", "RemoteWork", "OrgSize_grouped", "ICorPM", "MainBranch")
+
+
+def compute_aggregate(dataset: SurveyDataset, spec: AggregateSpec, rows=None):
+    """Compute one aggregate from the raw survey rows, or only the given row ids.
+
+    Counts come back as a DataFrame with "Value" and "Count" columns, most
+    frequent first; histograms have "bin_start", "bin_end" and "Count".
+    """
+    if spec.kind == "options":
+        counts = dataset.multiselect(spec.column).value_counts(rows)
+        return counts.rename(columns={"Option": "Value"})
+
+    if spec.kind == "value_counts":
+        index = dataset.categorical(spec.column, spec.bins, spec.labels)
+        return index.value_counts(rows, exclude=spec.exclude)
+
+    values = dataset.column(spec.column)
+    if rows is not None:
+        values = values.iloc[rows]
+    values = values.dropna()
+
+    if spec.kind == "describe":
+        return values.describe()
+
+    if spec.kind == "histogram":
+        values = values.to_numpy(dtype=float)
+        if spec.clip is not None and len(values):
+            low, high = np.percentile(values, spec.clip)
+            values = values[(values >= low) & (values <= high)]
+        return histogram_bins(values, maxbins=spec.maxbins)
+
+    raise ValueError(f"Unknown aggregate kind: {spec.kind}")
+
+
+def segment_rows(dataset: SurveyDataset, selections: dict) -> np.ndarray | None:
+    """Sorted row ids matching every filter, or None when nothing is selected.
+
+    `selections` maps a column in FILTER_COLUMNS to the answers to keep (any
+    of them). The smallest selection is expanded from its row groups and the
+    other filters are applied as code lookups on just those rows.
+    """
+    filters = []
+    for column, values in selections.items():
+        if values:
+            spec = AGGREGATE_SPECS[column]
+            filters.append((dataset.categorical(spec.column, spec.bins, spec.labels), values))
+    if not filters:
+        return None
+
+    filters.sort(key=lambda item: item[0].size_of(item[1]))
+    index, values = filters[0]
+    rows = index.rows_for(values)
+    for index, values in filters[1:]:
+        rows = rows[index.mask_for(values)[index.codes[rows]]]
+    return rows
+
+
+def source_digest(path: Path) -> str:
+    """SHA-1 of a file's contents, used to tell whether an artifact is stale"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_aggregates(dataset: SurveyDataset, source_path: Path = DATA_PATH) -> dict:
+    """Materialize every aggregate in AGGREGATE_SPECS into a versioned artifact"""
+    source_sig = file_signature(source_path)
+    return {
+        "version": AGGREGATES_VERSION,
+        "built_at": time.time(),
+        "n_rows": dataset.n_rows,
+        "source_size": source_sig[1] if source_sig else None,
+        "source_sha1": source_digest(source_path) if source_sig else None,
+        "aggregates": {name: compute_aggregate(dataset, spec) for name, spec in AGGREGATE_SPECS.items()},
+    }
+
+
+def save_aggregates(cube: dict, path: Path = AGGREGATES_PATH) -> Path:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(cube, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+    return path
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_cube(path: str, signature) -> dict | None:
+    if signature is None:
+        return None
+    with open(path, "rb") as f:
+        cube = pickle.load(f)
+    if cube.get("version") != AGGREGATES_VERSION:
+        return None
+    return cube
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _source_digest(path: str, signature) -> str:
+    return source_digest(Path(path))
+
+
+def is_stale(cube: dict, source_path: Path = DATA_PATH) -> bool:
+    """True when the source data differs from the one the artifact was built from.
+
+    Without a local copy of the data the artifact is the only source and is
+    never stale. The size is checked first so the hash is rarely needed.
+    """
+    source_sig = file_signature(source_path)
+    if source_sig is None:
+        return False
+    if cube["source_size"] != source_sig[1]:
+        return True
+    return cube["source_sha1"] != _source_digest(str(source_path), source_sig)
+
+
+@st.cache_resource(max_entries=len(AGGREGATE_SPECS) * 2, show_spinner=False)
+def _live_aggregate(name: str, signature):
+    # `signature` ties the cached result to the dataset version it came from
+    return compute_aggregate(get_survey(), AGGREGATE_SPECS[name])
+
+
+class DescriptiveAggregates:
+    """Chart data for the Descriptive Analysis page.
+
+    Served from the prebuilt artifact when it is up to date, otherwise
+    computed (once per dataset version) from the shared survey dataset.
+    With `rows` set, every aggregate is computed live for that segment.
+    Returned objects are shared between sessions and must not be modified.
+    """
+
+    def __init__(self, cube: dict | None, dataset: SurveyDataset | None, rows: np.ndarray | None = None):
+        self.cube = cube
+        self.dataset = dataset
+        self.rows = rows
+        self._segment: dict = {}
+
+    @property
+    def from_artifact(self) -> bool:
+        return self.cube is not None
+
+    @property
+    def n_rows(self) -> int:
+        if self.rows is not None:
+            return len(self.rows)
+        return self.cube["n_rows"] if self.cube is not None else self.dataset.n_rows
+
+    @property
+    def can_filter(self) -> bool:
+        """Filtering needs the survey rows, not just the artifact"""
+        return self.dataset is not None or survey_source()[1] is not None
+
+    def has(self, name: str) -> bool:
+        if self.cube is not None:
+            return name in self.cube["aggregates"]
+        return AGGREGATE_SPECS[name].column in self.dataset.columns
+
+    def __getitem__(self, name: str):
+        if self.rows is not None:
+            if name not in self._segment:
+                self._segment[name] = compute_aggregate(self.dataset, AGGREGATE_SPECS[name], self.rows)
+            return self._segment[name]
+        if self.cube is not None:
+            return self.cube["aggregates"][name]
+        return _live_aggregate(name, self.dataset.signature)
+
+    def filtered(self, selections: dict) -> "DescriptiveAggregates":
+        """Aggregates for the respondents matching `selections` (see segment_rows)"""
+        dataset = self.dataset if self.dataset is not None else get_survey()
+        rows = segment_rows(dataset, selections)
+        if rows is None:
+            return self
+        return DescriptiveAggregates(None, dataset, rows)
+
+
+def get_aggregates(path: Path = AGGREGATES_PATH, source_path: Path = DATA_PATH) -> DescriptiveAggregates:
+    """Aggregates from the artifact if it is current, else from the live dataset"""
+    cube = _load_cube(str(path), file_signature(path))
+    if cube is not None and not is_stale(cube, source_path):
+        return DescriptiveAggregates(cube, None)
+    return DescriptiveAggregates(None, get_survey())
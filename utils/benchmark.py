@@ -0,0 +1,121 @@
+import gc
+import os
+import pickle
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from utils.data import file_signature
+
+
+# Written by scripts/benchmark_models.py, apart from the model files and their metadata
+COSTS_PATH = Path("models/model_costs.pkl")
+# Columns added to the model comparison tables, in display order
+COST_COLUMNS = ["Load (ms)", "p50 (ms)", "p99 (ms)", "Throughput (rows/s)", "Size (MB)", "Peak memory (MB)"]
+
+
+def environment() -> dict:
+    """Where the numbers were measured; they only compare within one machine"""
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "cpus": os.cpu_count(),
+        "measured_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def load_pickle(path: Path):
+    """Unpickle one model file"""
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def best_time(run, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure_model(name: str, load, predict, single, batch, size_bytes: int,
+                  repeats: int = 200, batch_repeats: int = 3) -> dict:
+    """Cost of one model: load time, single-row latency, batch throughput, size and peak memory.
+
+    `load()` returns the model and `predict(model, rows)` scores rows
+    (`single` is one row, `batch` many). Timings run without tracing;
+    peak memory is a separate traced pass over a fresh load plus one batch,
+    and only counts allocations Python can see (NumPy arrays, pickled
+    objects), not memory reserved inside native libraries.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    model = load()
+    load_seconds = time.perf_counter() - start
+
+    predict(model, single)
+    latencies = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        predict(model, single)
+        latencies[i] = time.perf_counter() - start
+
+    batch_seconds = np.inf
+    for _ in range(batch_repeats):
+        start = time.perf_counter()
+        predict(model, batch)
+        batch_seconds = min(batch_seconds, time.perf_counter() - start)
+    del model
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        predict(load(), batch)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "Model": name,
+        "Load (ms)": load_seconds * 1000,
+        "p50 (ms)": float(np.percentile(latencies, 50)) * 1000,
+        "p99 (ms)": float(np.percentile(latencies, 99)) * 1000,
+        "Throughput (rows/s)": len(batch) / batch_seconds,
+        "Size (MB)": size_bytes / 1024 ** 2,
+        "Peak memory (MB)": peak / 1024 ** 2,
+    }
+
+
+def format_costs(frame):
+    """Round the cost columns of a comparison table for display"""
+    digits = {"Load (ms)": 1, "p50 (ms)": 2, "p99 (ms)": 2, "Throughput (rows/s)": 0,
+              "Size (MB)": 2, "Peak memory (MB)": 1}
+    return frame.round({c: d for c, d in digits.items() if c in frame.columns})
+
+
+def save_costs(costs: dict, path: Path = COSTS_PATH) -> Path:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(costs, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+    return path
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_costs(path: str, signature) -> dict:
+    if signature is None:
+        return {}
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_costs(path: Path = COSTS_PATH) -> dict:
+    """Measured costs: {"env": ..., "salary": [rows], "recommender": [rows]}, empty when not measured"""
+    return _load_costs(str(path), file_signature(path))
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+class CategoricalColumn:
+    """A single-choice survey column stored as integer codes with precomputed row groups.
+
+    `codes[i]` is the position of respondent i's answer in `categories` (-1
+    for a missing answer) and `groups[j]` holds the sorted row ids that gave
+    answer j, so selecting a segment is a lookup instead of a string
+    comparison over every row.
+    """
+
+    def __init__(self, name: str, codes: np.ndarray, categories: np.ndarray):
+        self.name = name
+        self.codes = codes
+        self.categories = categories
+
+        valid = np.flatnonzero(codes >= 0)
+        order = valid[np.argsort(codes[valid], kind="stable")].astype(np.int32)
+        self._counts = np.bincount(codes[valid], minlength=len(categories))
+        self.groups = np.split(order, np.cumsum(self._counts)[:-1])
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.codes)
+
+    def codes_for(self, values) -> np.ndarray:
+        """Codes of the given answers; answers that never occur are ignored"""
+        return np.flatnonzero(pd.Index(self.categories).isin(list(values)))
+
+    def size_of(self, values) -> int:
+        """Number of rows with any of the given answers"""
+        return int(self._counts[self.codes_for(values)].sum())
+
+    def rows_for(self, values) -> np.ndarray:
+        """Sorted row ids with any of the given answers"""
+        codes = self.codes_for(values)
+        if len(codes) == 1:
+            return self.groups[codes[0]]
+        return np.sort(np.concatenate([self.groups[c] for c in codes] or [np.empty(0, np.int32)]))
+
+    def mask_for(self, values) -> np.ndarray:
+        """Lookup table over codes: mask_for(values)[codes] is True on matching rows.
+
+        The table has one extra, always-False slot at the end, so missing
+        answers (code -1) index it and never match.
+        """
+        lookup = np.zeros(len(self.categories) + 1, dtype=bool)
+        lookup[self.codes_for(values)] = True
+        return lookup
+
+    def counts(self, rows=None) -> np.ndarray:
+        """Rows per answer, over all rows or only the given row ids"""
+        if rows is None:
+            return self._counts
+        codes = self.codes[rows]
+        return np.bincount(codes[codes >= 0], minlength=len(self.categories))
+
+    def value_counts(self, rows=None, exclude=()) -> pd.DataFrame:
+        """Answers and their counts, most frequent first, dropping unused and excluded answers"""
+        counts = self.counts(rows).copy()
+        if exclude:
+            counts[self.codes_for(exclude)] = 0
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        return pd.DataFrame({"Value": self.categories[order], "Count": counts[order]})
+
+    def binned(self, bins, labels) -> "CategoricalColumn":
+        """Numeric answers grouped into labelled ranges (pd.cut semantics)"""
+        label_codes = pd.cut(
+            pd.Series(self.categories, dtype=float), bins=list(bins), labels=list(labels)
+        ).cat.codes.to_numpy()
+        # Extra slot so missing answers (-1) stay missing
+        lookup = np.append(label_codes, -1)
+        return CategoricalColumn.from_codes(self.name, lookup[self.codes], np.asarray(labels, dtype=object))
+
+    @classmethod
+    def from_codes(cls, name: str, codes: np.ndarray, categories) -> "CategoricalColumn":
+        return cls(name, np.asarray(codes, dtype=np.int32), np.asarray(categories))
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "CategoricalColumn":
+        codes, uniques = pd.factorize(series)
+        return cls.from_codes(series.name, codes, uniques)
@@ -0,0 +1,170 @@
+import copy
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+SO_ORANGE = "#F48024"
+SPEC_CACHE_SIZE = 256
+
+
+@alt.theme.register("stackoverflow", enable=True)
+def stackoverflow_theme() -> alt.theme.ThemeConfig:
+    """Inter axes and orange bars, shared by every chart instead of per-chart configure_*"""
+    return {
+        "config": {
+            "axis": {
+                "labelFont": "Inter",
+                "titleFont": "Inter",
+                "labelFontSize": 12,
+                "titleFontSize": 13,
+            },
+            "bar": {"color": SO_ORANGE},
+            "title": {"font": "Inter", "fontSize": 14, "anchor": "start"},
+        }
+    }
+
+
+def nice_bin_step(low: float, high: float, maxbins: int) -> float:
+    """Smallest 1/2/5 x 10^k step that covers [low, high] in at most maxbins bins.
+
+    Mirrors the step Vega-Lite picks for `alt.Bin(maxbins=...)`, so the
+    server-side bins look like the ones the browser used to compute.
+    """
+    span = high - low
+    if span <= 0:
+        return 1.0
+    raw_step = span / maxbins
+    base = 10 ** math.floor(math.log10(raw_step))
+    for factor in (1, 2, 5, 10):
+        if base * factor >= raw_step:
+            return base * factor
+    return base * 10
+
+
+def histogram_bins(values, maxbins: int = 40) -> pd.DataFrame:
+    """Bin values with NumPy into "bin_start", "bin_end" and "Count" columns"""
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return pd.DataFrame({"bin_start": [], "bin_end": [], "Count": []})
+    low, high = values.min(), values.max()
+    step = nice_bin_step(low, high, maxbins)
+    start = math.floor(low / step) * step
+    stop = max(math.ceil(high / step) * step, start + step)
+    edges = np.arange(start, stop + step / 2, step)
+    counts, edges = np.histogram(values, bins=edges)
+    return pd.DataFrame({
+        "bin_start": edges[:-1],
+        "bin_end": edges[1:],
+        "Count": counts.astype(np.int64),
+    })
+
+
+def payload_bytes(frame: pd.DataFrame) -> int:
+    """Approximate size of a chart's data once serialized to Arrow"""
+    return int(frame.memory_usage(index=False).sum())
+
+
+def bar_chart(data: pd.DataFrame, category: str, axis_title: str, value: str = "Count",
+              value_title: str = "Number of respondents", height: int = 400,
+              vertical: bool = False, full_labels: bool = False) -> alt.Chart:
+    """Bar chart of counts per category, largest first; every column goes in the tooltip"""
+    axis = alt.Axis(labelLimit=0, labelOverlap=False) if full_labels else alt.Axis()
+    if vertical:
+        encoding = dict(
+            x=alt.X(f"{category}:N", sort="-y", title=axis_title, axis=axis),
+            y=alt.Y(f"{value}:Q", title=value_title),
+        )
+    else:
+        encoding = dict(
+            y=alt.Y(f"{category}:N", sort="-x", title=axis_title, axis=axis),
+            x=alt.X(f"{value}:Q", title=value_title),
+        )
+    return alt.Chart(data).mark_bar().encode(
+        tooltip=list(data.columns), **encoding
+    ).properties(width=750, height=height)
+
+
+def histogram_chart(bins: pd.DataFrame, axis_title: str) -> alt.Chart:
+    """Bar chart of bins from histogram_bins()"""
+    return alt.Chart(bins).mark_bar().encode(
+        x=alt.X("bin_start:Q", bin="binned", title=axis_title),
+        x2="bin_end:Q",
+        y=alt.Y("Count:Q", title="Number of respondents"),
+        tooltip=[
+            alt.Tooltip("bin_start:Q", title="From"),
+            alt.Tooltip("bin_end:Q", title="To"),
+            "Count",
+        ],
+    ).properties(width=750, height=400)
+
+
+def line_chart(data: pd.DataFrame, x: str, y: str, x_title: str, y_title: str,
+               height: int = 360) -> alt.Chart:
+    """Line with points over a numeric x; the y axis does not start at zero"""
+    return alt.Chart(data).mark_line(point=True, color=SO_ORANGE).encode(
+        x=alt.X(f"{x}:Q", title=x_title),
+        y=alt.Y(f"{y}:Q", title=y_title, scale=alt.Scale(zero=False)),
+        tooltip=list(data.columns),
+    ).properties(width=750, height=height)
+
+
+def heatmap_chart(data: pd.DataFrame, x: str, y: str, value: str, x_title: str, y_title: str,
+                  value_title: str, height: int = 420) -> alt.Chart:
+    """Grid of cells over two discrete axes, coloured by value"""
+    return alt.Chart(data).mark_rect().encode(
+        x=alt.X(f"{x}:O", title=x_title),
+        y=alt.Y(f"{y}:O", title=y_title, axis=alt.Axis(labelLimit=0)),
+        color=alt.Color(f"{value}:Q", title=value_title, scale=alt.Scale(scheme="oranges")),
+        tooltip=list(data.columns),
+    ).properties(width=750, height=height)
+
+
+def data_fingerprint(frame: pd.DataFrame) -> str:
+    """Content hash of a chart's data (values and column names)"""
+    digest = hashlib.sha1(repr(list(frame.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+_spec_cache: OrderedDict[str, dict] = OrderedDict()
+_spec_lock = threading.Lock()
+
+
+def cached_spec(builder, data: pd.DataFrame, **params) -> dict:
+    """Finished Vega-Lite spec for builder(data, **params), shared across sessions.
+
+    Keyed on the builder, a hash of the data and the parameters, and kept in
+    a process-wide LRU of SPEC_CACHE_SIZE entries. Inline datasets are stored
+    as DataFrames so Streamlit can send them as Arrow without re-parsing JSON.
+    """
+    key = f"{builder.__qualname__}:{data_fingerprint(data)}:{sorted(params.items())!r}"
+    with _spec_lock:
+        if key in _spec_cache:
+            _spec_cache.move_to_end(key)
+            return _spec_cache[key]
+
+    spec = builder(data, **params).to_dict()
+    spec["datasets"] = {name: pd.DataFrame(rows) for name, rows in spec.get("datasets", {}).items()}
+
+    with _spec_lock:
+        _spec_cache[key] = spec
+        while len(_spec_cache) > SPEC_CACHE_SIZE:
+            _spec_cache.popitem(last=False)
+    return spec
+
+
+def show_chart(builder, data: pd.DataFrame, **params):
+    """Render a chart from the spec cache"""
+    spec = cached_spec(builder, data, **params)
+    # Streamlit edits the spec it is given, so hand it a copy; the DataFrames
+    # themselves are only read
+    spec_copy = copy.deepcopy({key: value for key, value in spec.items() if key != "datasets"})
+    spec_copy["datasets"] = dict(spec["datasets"])
+    st.vega_lite_chart(spec_copy, use_container_width=True)
@@ -0,0 +1,163 @@
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.data import SurveyDataset, file_signature
+from utils.profiles import label_key
+
+
+COHORTS_PATH = Path("models/salary_cohorts.pkl")
+# Bump whenever the layout of the stored cube changes
+COHORTS_VERSION = 1
+
+SALARY_COLUMN = "ConvertedCompYearly"
+# Years of professional experience: [0, 2), [2, 5), [5, 10), [10, 20), [20, ∞)
+EXPERIENCE_EDGES = (2, 5, 10, 20)
+EXPERIENCE_LABELS = ("0-1 years", "2-4 years", "5-9 years", "10-19 years", "20+ years")
+QUANTILES = (10, 25, 50, 75, 90)
+# Cohorts smaller than this fall back to a wider one (any role, then any region)
+MIN_COHORT = 30
+ANY = "*"
+
+
+def experience_bucket(work_exp: float) -> int:
+    return int(np.searchsorted(EXPERIENCE_EDGES, work_exp, side="right"))
+
+
+@dataclass(frozen=True)
+class Cohort:
+    """Salaries of the respondents sharing a profile's region, role and experience"""
+    description: str
+    salaries: np.ndarray    # sorted, read-only view into the cube
+    quantiles: dict
+
+    @property
+    def size(self) -> int:
+        return len(self.salaries)
+
+    def percentile_rank(self, salary: float) -> float:
+        """Share of the cohort (in %) earning at most `salary`"""
+        return 100 * np.searchsorted(self.salaries, salary, side="right") / self.size
+
+
+class CohortCube:
+    """Sorted survey salaries for every region × role × experience bucket.
+
+    All cells, including the "any region" and "any role" roll-ups, live in
+    one sorted float32 array; `offsets` delimit each cell and `quantiles`
+    holds its precomputed percentiles. A lookup is a few dictionary reads
+    and a slice, and ranking a salary is one binary search.
+    """
+
+    def __init__(self, regions, roles, salaries: np.ndarray, offsets: np.ndarray, quantiles: np.ndarray):
+        self.regions = list(regions)
+        self.roles = list(roles)
+        self.salaries = salaries
+        self.offsets = offsets
+        self.quantiles = quantiles
+        self._region_index = {r: i for i, r in enumerate(self.regions)}
+        self._role_index = {r: i for i, r in enumerate(self.roles)}
+
+    def _cell(self, region: int, role: int, bucket: int) -> int:
+        return (region * len(self.roles) + role) * len(EXPERIENCE_LABELS) + bucket
+
+    def cohort(self, region: str, role: str, work_exp: float) -> Cohort | None:
+        """The narrowest cohort with at least MIN_COHORT salaries, or None"""
+        bucket = experience_bucket(work_exp)
+        any_region, any_role = self._region_index[ANY], self._role_index[ANY]
+        # None for a region or role the survey has no salaries for
+        region_i = self._region_index.get(region)
+        role_i = self._role_index.get(label_key(role))
+        experience = EXPERIENCE_LABELS[bucket]
+        candidates = [
+            (region_i, role_i, f"{role} in {region}, {experience}"),
+            (region_i, any_role, f"All roles in {region}, {experience}"),
+            (any_region, role_i, f"{role} worldwide, {experience}"),
+            (any_region, any_role, f"All respondents, {experience}"),
+        ]
+        for r, k, description in candidates:
+            if r is None or k is None:
+                continue
+            cell = self._cell(r, k, bucket)
+            start, stop = self.offsets[cell], self.offsets[cell + 1]
+            if stop - start >= MIN_COHORT:
+                return Cohort(description, self.salaries[start:stop],
+                              dict(zip(QUANTILES, self.quantiles[cell].tolist())))
+        return None
+
+
+def build_cohorts(dataset: SurveyDataset) -> dict:
+    """Compute the cube from the survey rows with a salary and experience"""
+    salary = pd.to_numeric(dataset.column(SALARY_COLUMN), errors="coerce").to_numpy(dtype=float)
+    work_exp = pd.to_numeric(dataset.column("WorkExp"), errors="coerce").to_numpy(dtype=float)
+    region = dataset.column("Region").astype(str).to_numpy()
+    devtypes = dataset.multiselect("DevType")
+    valid = np.isfinite(salary) & (salary > 0) & np.isfinite(work_exp)
+
+    regions = sorted(set(region[valid])) + [ANY]
+    region_codes = pd.Index(regions).get_indexer(region)
+    # Survey answers and form labels meet on label_key ("Developer, back-end" ~ "Developer  Back End")
+    role_keys = [label_key(r) for r in devtypes.vocabulary]
+    roles = list(dict.fromkeys(role_keys)) + [ANY]
+    role_codes = pd.Index(roles).get_indexer(role_keys)
+    buckets = np.searchsorted(EXPERIENCE_EDGES, work_exp, side="right")
+    n_buckets = len(EXPERIENCE_LABELS)
+
+    # (row, role) pairs: every role a respondent selected, plus "any role"
+    selections = devtypes.matrix.tocoo()
+    rows = np.concatenate([selections.row, np.flatnonzero(valid)])
+    row_roles = np.concatenate([role_codes[selections.col], np.full(valid.sum(), len(roles) - 1)])
+    keep = valid[rows]
+    rows, row_roles = rows[keep], row_roles[keep]
+
+    cells, values = [], []
+    for region_part in (region_codes[rows], np.full(len(rows), len(regions) - 1)):
+        cells.append((region_part * len(roles) + row_roles) * n_buckets + buckets[rows])
+        values.append(salary[rows])
+    cells, values = np.concatenate(cells), np.concatenate(values).astype(np.float32)
+    order = np.lexsort((values, cells))
+    cells, values = cells[order], values[order]
+
+    n_cells = len(regions) * len(roles) * n_buckets
+    offsets = np.searchsorted(cells, np.arange(n_cells + 1))
+    quantiles = np.full((n_cells, len(QUANTILES)), np.nan, dtype=np.float32)
+    for cell in np.flatnonzero(np.diff(offsets)):
+        quantiles[cell] = np.percentile(values[offsets[cell]:offsets[cell + 1]], QUANTILES)
+
+    return {
+        "version": COHORTS_VERSION,
+        "n_rows": int(valid.sum()),
+        "regions": regions,
+        "roles": roles,
+        "salaries": values,
+        "offsets": offsets,
+        "quantiles": quantiles,
+    }
+
+
+def save_cohorts(cube: dict, path: Path = COHORTS_PATH) -> Path:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(cube, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+    return path
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_cohorts(path: str, signature) -> CohortCube | None:
+    if signature is None:
+        return None
+    with open(path, "rb") as f:
+        cube = pickle.load(f)
+    if cube.get("version") != COHORTS_VERSION:
+        return None
+    return CohortCube(cube["regions"], cube["roles"], cube["salaries"], cube["offsets"], cube["quantiles"])
+
+
+def load_cohorts(path: Path = COHORTS_PATH) -> CohortCube | None:
+    """The prebuilt cohort cube, or None when it has not been built"""
+    return _load_cohorts(str(path), file_signature(path))
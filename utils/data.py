@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from utils.categorical import CategoricalColumn
+from utils.multiselect import MultiSelectColumn
+from utils.postings import PostingList
+
+
+DATA_PATH = Path("data/variabile_preprocesate.csv")
+ARROW_PATH = DATA_PATH.with_suffix(".arrow")
+
+
+def file_signature(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) for a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def to_arrow_table(frame: pd.DataFrame) -> pa.Table:
+    """Convert the survey frame to Arrow, dictionary-encoding every text column"""
+    table = pa.Table.from_pandas(frame, preserve_index=False).combine_chunks()
+    for i, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+    return table
+
+
+def convert_to_arrow(csv_path: Path = DATA_PATH, arrow_path: Path = ARROW_PATH) -> Path:
+    """Write the survey CSV as an uncompressed Arrow IPC file.
+
+    The file is left uncompressed on purpose so it can be memory-mapped and
+    read without copying.
+    """
+    table = to_arrow_table(pd.read_csv(csv_path))
+    tmp_path = arrow_path.with_name(arrow_path.name + ".tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+    return arrow_path
+
+
+class SurveyDataset:
+    """Survey data loaded once per server process and shared by every session.
+
+    Columns are kept in Arrow (memory-mapped when read from the .arrow file)
+    and converted to pandas only when a page asks for them, so resident
+    memory grows with the columns actually used. Converted columns are
+    shared between sessions and must be treated as read-only.
+    """
+
+    def __init__(self, table: pa.Table, path: Path, signature, load_seconds: float):
+        self.table = table
+        self.path = path
+        self.signature = signature
+        self.load_seconds = load_seconds
+        self._series: dict[str, pd.Series] = {}
+        self._series_bytes: dict[str, int] = {}
+        self._multiselect: dict[str, MultiSelectColumn] = {}
+        self._categorical: dict[tuple, CategoricalColumn] = {}
+        self._postings: dict[str, PostingList] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def n_rows(self) -> int:
+        return self.table.num_rows
+
+    @property
+    def columns(self) -> list[str]:
+        return self.table.column_names
+
+    @property
+    def loaded_columns(self) -> list[str]:
+        return list(self._series)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memory used by the columns converted to pandas so far"""
+        return sum(self._series_bytes.values())
+
+    @property
+    def mapped_bytes(self) -> int:
+        """Size of the Arrow buffers (mapped from disk for .arrow files)"""
+        return self.table.nbytes
+
+    def column(self, name: str) -> pd.Series:
+        with self._lock:
+            if name not in self._series:
+                chunked = self.table.column(name)
+                if pa.types.is_dictionary(chunked.type):
+                    chunked = chunked.cast(chunked.type.value_type)
+                series = chunked.to_pandas().rename(name)
+                self._series[name] = series
+                self._series_bytes[name] = int(series.memory_usage(index=False, deep=True))
+            return self._series[name]
+
+    def multiselect(self, name: str) -> MultiSelectColumn:
+        """Multi-hot view of a semicolon-delimited column, parsed on first use"""
+        with self._lock:
+            if name not in self._multiselect:
+                chunked = self.table.column(name)
+                if pa.types.is_dictionary(chunked.type):
+                    # Only the distinct answers in the Arrow dictionary need parsing
+                    array = chunked.combine_chunks()
+                    codes = pc.fill_null(array.indices, -1).to_numpy(zero_copy_only=False)
+                    column = MultiSelectColumn.from_codes(name, codes, array.dictionary.to_pylist())
+                else:
+                    column = MultiSelectColumn.from_series(chunked.to_pandas().rename(name))
+                self._multiselect[name] = column
+            return self._multiselect[name]
+
+    def postings(self, name: str) -> PostingList:
+        """Per-option row bitmaps of a semicolon-delimited column, built on first use"""
+        # multiselect() takes the lock itself, so resolve it first
+        column = self.multiselect(name)
+        with self._lock:
+            if name not in self._postings:
+                self._postings[name] = PostingList.from_multiselect(column)
+            return self._postings[name]
+
+    def categorical(self, name: str, bins=None, labels=None) -> CategoricalColumn:
+        """Integer-coded view of a single-choice column, with numeric answers
+        optionally binned into labelled ranges; built on first use"""
+        with self._lock:
+            raw = self._categorical.get((name, None, None))
+            if raw is None:
+                chunked = self.table.column(name)
+                if pa.types.is_dictionary(chunked.type):
+                    # The Arrow dictionary already holds the codes
+                    array = chunked.combine_chunks()
+                    codes = pc.fill_null(array.indices, -1).to_numpy(zero_copy_only=False)
+                    raw = CategoricalColumn.from_codes(name, codes, array.dictionary.to_numpy(zero_copy_only=False))
+                else:
+                    raw = CategoricalColumn.from_series(chunked.to_pandas().rename(name))
+                self._categorical[(name, None, None)] = raw
+            if bins is None or not pd.api.types.is_numeric_dtype(raw.categories):
+                return raw
+            key = (name, tuple(bins), tuple(labels))
+            if key not in self._categorical:
+                self._categorical[key] = raw.binned(bins, labels)
+            return self._categorical[key]
+
+    def frame(self, columns=None) -> pd.DataFrame:
+        """DataFrame with only the requested columns (missing ones are skipped)"""
+        names = self.columns if columns is None else [c for c in columns if c in self.columns]
+        return pd.DataFrame({name: self.column(name) for name in names}, copy=False)
+
+    @classmethod
+    def from_arrow(cls, path: Path) -> "SurveyDataset":
+        start = time.perf_counter()
+        source = pa.memory_map(str(path), "r")
+        table = pa.ipc.open_file(source).read_all()
+        return cls(table, path, file_signature(path), time.perf_counter() - start)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "SurveyDataset":
+        start = time.perf_counter()
+        table = to_arrow_table(pd.read_csv(path))
+        return cls(table, path, file_signature(path), time.perf_counter() - start)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_survey(path: str, signature) -> SurveyDataset:
+    # `signature` is only part of the cache key: a changed file gets a new entry
+    # and max_entries=1 drops the stale one.
+    path = Path(path)
+    if path.suffix == ".arrow":
+        return SurveyDataset.from_arrow(path)
+    return SurveyDataset.from_csv(path)
+
+
+def survey_source(csv_path: Path = DATA_PATH, arrow_path: Path = ARROW_PATH) -> tuple[Path, tuple | None]:
+    """Path and signature of the file to load: the .arrow copy unless it is missing or older than the CSV"""
+    csv_sig = file_signature(csv_path)
+    arrow_sig = file_signature(arrow_path)
+    if arrow_sig is not None and (csv_sig is None or arrow_sig[0] >= csv_sig[0]):
+        return arrow_path, arrow_sig
+    return csv_path, csv_sig
+
+
+def open_survey(csv_path: Path = DATA_PATH, arrow_path: Path = ARROW_PATH) -> SurveyDataset:
+    """Load the dataset without the Streamlit cache (for offline scripts)"""
+    path, _ = survey_source(csv_path, arrow_path)
+    if path.suffix == ".arrow":
+        return SurveyDataset.from_arrow(path)
+    return SurveyDataset.from_csv(path)
+
+
+def get_survey(csv_path: Path = DATA_PATH, arrow_path: Path = ARROW_PATH) -> SurveyDataset:
+    """Shared survey dataset, reloaded only when the file on disk changes"""
+    path, signature = survey_source(csv_path, arrow_path)
+    return _load_survey(str(path), signature)
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+# Rows per block are chosen so one layer's activations stay around this many values (16 MB)
+BLOCK_VALUES = 1 << 22
+
+ACTIVATIONS = {
+    "identity": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0, out=x),
+    "tanh": lambda x: np.tanh(x, out=x),
+    "logistic": lambda x: np.reciprocal(1 + np.exp(-x, out=x), out=x),
+}
+
+
+class NumpyMLP:
+    """Forward pass of the recommender's scikit-learn MLPs in plain float32 NumPy.
+
+    A MultiOutputClassifier holds one identically shaped binary network per
+    output; their weights are stacked into (networks, in, out) arrays, so
+    every layer of every network is one batched matrix product. A single
+    multilabel MLPClassifier is the one-network case with an output per
+    label. predict_proba returns the (rows, outputs) probability of the
+    positive class, like utils.recommender.positive_probabilities.
+
+    Built by scripts/export_recommender_mlp.py, which checks it against
+    predict_proba before saving.
+    """
+
+    def __init__(self, coefs, intercepts, activation: str):
+        self.coefs = [np.ascontiguousarray(w, dtype=np.float32) for w in coefs]          # (networks, in, out)
+        self.intercepts = [np.ascontiguousarray(b, dtype=np.float32) for b in intercepts]  # (networks, 1, out)
+        self.activation = activation
+        self._hidden = ACTIVATIONS[activation]
+        widest = max(w.shape[0] * w.shape[2] for w in self.coefs)
+        self.row_block = max(1, BLOCK_VALUES // widest)
+
+    @property
+    def n_outputs(self) -> int:
+        return self.coefs[-1].shape[0] * self.coefs[-1].shape[2]
+
+    def predict_proba(self, features) -> np.ndarray:
+        features = np.asarray(features, dtype=np.float32)
+        out = np.empty((len(features), self.n_outputs), dtype=np.float32)
+        # exp overflows to inf for very negative logits, which the logistic maps to 0 as it should
+        with np.errstate(over="ignore"):
+            for start in range(0, len(features), self.row_block):
+                h = features[np.newaxis, start:start + self.row_block]
+                for w, b in zip(self.coefs[:-1], self.intercepts[:-1]):
+                    h = self._hidden(h @ w + b)
+                proba = ACTIVATIONS["logistic"](h @ self.coefs[-1] + self.intercepts[-1])  # (networks, rows, out)
+                out[start:start + self.row_block] = proba.transpose(1, 0, 2).reshape(proba.shape[1], -1)
+        return out
+
+    @classmethod
+    def from_sklearn(cls, model) -> "NumpyMLP":
+        """Convert a fitted MultiOutputClassifier of binary MLPClassifiers, or a multilabel MLPClassifier"""
+        networks = getattr(model, "estimators_", [model])
+        for network in networks:
+            if network.out_activation_ != "logistic":
+                raise ValueError(f"Unsupported output activation {network.out_activation_!r}")
+            if len(networks) > 1 and list(network.classes_) != [0, 1]:
+                raise ValueError(f"Expected binary 0/1 outputs, got classes {list(network.classes_)}")
+        shapes = {tuple(w.shape for w in network.coefs_) for network in networks}
+        if len(shapes) > 1:
+            raise ValueError("The networks have different layer sizes and cannot be stacked")
+        activations = {network.activation for network in networks}
+        if len(activations) > 1:
+            raise ValueError("The networks use different activations")
+        coefs = [np.stack([network.coefs_[i] for network in networks]) for i in range(len(networks[0].coefs_))]
+        intercepts = [
+            np.stack([network.intercepts_[i] for network in networks])[:, np.newaxis, :]
+            for i in range(len(networks[0].intercepts_))
+        ]
+        return cls(coefs, intercepts, activations.pop())
+
+    def arrays(self, prefix: str = "") -> dict:
+        """The network as named arrays, for np.savez"""
+        arrays = {f"{prefix}activation": np.array(self.activation)}
+        for i, (w, b) in enumerate(zip(self.coefs, self.intercepts)):
+            arrays[f"{prefix}coef_{i}"] = w
+            arrays[f"{prefix}intercept_{i}"] = b
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str = "") -> "NumpyMLP":
+        n_layers = sum(1 for name in arrays.files if name.startswith(f"{prefix}coef_"))
+        return cls(
+            [arrays[f"{prefix}coef_{i}"] for i in range(n_layers)],
+            [arrays[f"{prefix}intercept_{i}"] for i in range(n_layers)],
+            str(arrays[f"{prefix}activation"]),
+        )
@@ -0,0 +1,225 @@
+import pickle
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import streamlit as st
+from catboost import CatBoostError, CatBoostRegressor
+
+from utils.explain import SalaryExplainer
+from utils.mlp import NumpyMLP
+from utils.prediction_cache import artifact_hash
+from utils.recommender import InputTransformer
+from utils.salary import SalaryEncoder
+
+
+SALARY_MODEL_PATH = Path("models/best_salary_model_catboost.pkl")
+SALARY_META_PATH = Path("models/model_metadata_catboost.pkl")
+# Native CatBoost copy of the pickle, written by scripts/export_salary_model.py
+SALARY_CBM_PATH = SALARY_MODEL_PATH.with_suffix(".cbm")
+SALARY_FILES = [SALARY_MODEL_PATH, SALARY_CBM_PATH, SALARY_META_PATH]
+
+# How the running process loaded the salary model ("source", "seconds")
+salary_load_report: dict = {}
+
+RECOMMENDER_DIR = Path("models")
+# Every file that affects a recommendation (model_comparison_results holds use_scaled)
+RECOMMENDER_FILES = [
+    RECOMMENDER_DIR / name
+    for name in (
+        "recomandare_model_best.pkl",
+        "recomandare_encoder.pkl",
+        "recomandare_scaler.pkl",
+        "recomandare_input_cols.pkl",
+        "recomandare_output_cols.pkl",
+        "model_comparison_results.pkl",
+    )
+]
+# NumPy forward pass and compiled preprocessing, written (and checked) by scripts/export_recommender_mlp.py
+RECOMMENDER_MLP_PATH = RECOMMENDER_DIR / "recomandare_mlp.npz"
+# The files the export is built from; their hash is stored in it and checked on load
+RECOMMENDER_EXPORT_SOURCES = [
+    RECOMMENDER_DIR / name
+    for name in (
+        "recomandare_model_best.pkl",
+        "recomandare_encoder.pkl",
+        "recomandare_scaler.pkl",
+        "recomandare_input_cols.pkl",
+        "recomandare_dropdown_options.pkl",
+    )
+]
+
+
+def load_native_model(path: Path = SALARY_CBM_PATH, from_buffer: bool = False) -> CatBoostRegressor:
+    """Load a model saved in CatBoost's .cbm format, from the file or from an in-memory copy of it"""
+    model = CatBoostRegressor()
+    if from_buffer:
+        model.load_model(blob=path.read_bytes())
+    else:
+        model.load_model(str(path), format="cbm")
+    return model
+
+
+def export_native_model(model: CatBoostRegressor, path: Path = SALARY_CBM_PATH) -> Path:
+    tmp_path = path.with_name(path.name + ".tmp")
+    model.save_model(str(tmp_path), format="cbm")
+    tmp_path.replace(path)
+    return path
+
+
+def native_model_is_current() -> bool:
+    """True when the .cbm file exists and is not older than the pickle"""
+    if not SALARY_CBM_PATH.exists():
+        return False
+    if not SALARY_MODEL_PATH.exists():
+        return True
+    return SALARY_CBM_PATH.stat().st_mtime_ns >= SALARY_MODEL_PATH.stat().st_mtime_ns
+
+
+@st.cache_resource(show_spinner=False)
+def load_salary_model():
+    """Load salary prediction model and metadata.
+
+    The native .cbm export is preferred; the pickle is the fallback when the
+    export is missing, older than the pickle or unreadable.
+    """
+    if not SALARY_META_PATH.exists():
+        raise FileNotFoundError(SALARY_META_PATH)
+
+    start = time.perf_counter()
+    model = None
+    if native_model_is_current():
+        try:
+            model = load_native_model()
+            source = "cbm"
+        except CatBoostError:
+            model = None
+    if model is None:
+        if not SALARY_MODEL_PATH.exists():
+            raise FileNotFoundError(SALARY_MODEL_PATH)
+        model: CatBoostRegressor = joblib.load(SALARY_MODEL_PATH)
+        source = "pickle"
+    salary_load_report.update(source=source, seconds=time.perf_counter() - start)
+
+    meta = joblib.load(SALARY_META_PATH)
+    return model, meta
+
+
+@st.cache_resource(show_spinner=False)
+def load_salary_encoder() -> SalaryEncoder:
+    """Feature encoder for the salary model, built once from its metadata"""
+    _, meta = load_salary_model()
+    return SalaryEncoder(meta)
+
+
+@st.cache_resource(show_spinner=False)
+def load_salary_explainer() -> SalaryExplainer:
+    """SHAP explainer for the salary model, with its baselines computed once"""
+    model, _ = load_salary_model()
+    return SalaryExplainer(model, load_salary_encoder())
+
+
+def _load_pickle(name: str):
+    with open(RECOMMENDER_DIR / name, "rb") as f:
+        return pickle.load(f)
+
+
+@st.cache_resource(show_spinner=False)
+def load_recommender_metadata():
+    """Column lists, form options and comparison results of the recommender.
+
+    Returns (input_cols, output_cols, dropdown_options, model_info);
+    model_info is None when its file is missing. These are plain Python
+    objects, so loading them does not import scikit-learn.
+    """
+    try:
+        model_info = _load_pickle("model_comparison_results.pkl")
+    except FileNotFoundError:
+        model_info = None
+
+    input_cols = _load_pickle("recomandare_input_cols.pkl")
+    output_cols = _load_pickle("recomandare_output_cols.pkl")
+    dropdown_options = _load_pickle("recomandare_dropdown_options.pkl")
+    return input_cols, output_cols, dropdown_options, model_info
+
+
+@st.cache_resource(show_spinner=False)
+def load_recommender():
+    """Load the recommendation model, its preprocessing and column lists.
+
+    Returns (model, encoder, scaler, input_cols, output_cols,
+    dropdown_options, model_info); scaler and model_info are None when
+    their files are missing.
+    """
+    input_cols, output_cols, dropdown_options, model_info = load_recommender_metadata()
+
+    model = _load_pickle("recomandare_model_best.pkl")
+    encoder = _load_pickle("recomandare_encoder.pkl")
+
+    try:
+        scaler = _load_pickle("recomandare_scaler.pkl")
+    except FileNotFoundError:
+        scaler = None  # Some models don't need scaling
+
+    return model, encoder, scaler, input_cols, output_cols, dropdown_options, model_info
+
+
+@st.cache_resource(show_spinner=False)
+def load_input_transformer() -> InputTransformer:
+    """Recommender preprocessing compiled from its fitted encoder and scaler"""
+    _, encoder, scaler, input_cols, _, dropdown_options, model_info = load_recommender()
+    use_scaled = bool(model_info and model_info.get("use_scaled", False))
+    return InputTransformer.from_fitted(encoder, scaler, input_cols, dropdown_options["DevType"], use_scaled)
+
+
+def save_recommender_export(mlp: NumpyMLP, transformer: InputTransformer, path: Path = RECOMMENDER_MLP_PATH) -> Path:
+    tmp_path = path.with_name(path.name + ".tmp.npz")
+    np.savez(
+        tmp_path,
+        source_hash=np.array(artifact_hash(RECOMMENDER_EXPORT_SOURCES)),
+        **mlp.arrays("mlp_"),
+        **transformer.arrays("input_"),
+    )
+    tmp_path.replace(path)
+    return path
+
+
+@st.cache_resource(show_spinner=False)
+def load_recommender_export() -> tuple[NumpyMLP, InputTransformer] | None:
+    """The NumPy recommender and its input transformer, or None when the
+    export is missing or was built from different scikit-learn files"""
+    if not RECOMMENDER_MLP_PATH.exists():
+        return None
+    with np.load(RECOMMENDER_MLP_PATH) as arrays:
+        if "source_hash" not in arrays.files or str(arrays["source_hash"]) != artifact_hash(RECOMMENDER_EXPORT_SOURCES):
+            return None
+        return NumpyMLP.from_arrays(arrays, "mlp_"), InputTransformer.from_arrays(arrays, "input_")
+
+
+@st.cache_resource(show_spinner=False)
+def load_recommender_scorer():
+    """(model, input transformer) for serving recommendations.
+
+    The NumPy export is preferred, so scikit-learn is never imported to
+    answer a request; otherwise the pickled model and the transformer
+    compiled from the pickled preprocessing are used.
+    """
+    exported = load_recommender_export()
+    if exported is not None:
+        return exported
+    return load_recommender()[0], load_input_transformer()
+
+
+def warm_salary_model():
+    """Run one throwaway prediction so CatBoost's lazy initialization happens now"""
+    model, _ = load_salary_model()
+    encoder = load_salary_encoder()
+    features = encoder.encode_one("Unknown", "Other", "Something else", 0, 0, "")
+    model.predict(encoder.pool(features))
+
+
+def warm_recommender():
+    """Push one row through the serving model"""
+    model, transformer = load_recommender_scorer()
+    model.predict_proba(np.zeros((1, len(transformer.input_cols)), dtype=np.float32))
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class MultiSelectColumn:
+    """A semicolon-delimited survey column parsed once into a sparse multi-hot matrix.
+
+    Row i of `matrix` has a 1 in column j when respondent i selected
+    `vocabulary[j]`, so counts for any group of respondents are column sums
+    over their rows instead of a Python loop over the raw strings.
+    """
+
+    def __init__(self, name: str, matrix: sparse.csr_matrix, vocabulary: np.ndarray):
+        self.name = name
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self._counts = self._column_sums(matrix)
+
+    @property
+    def n_rows(self) -> int:
+        return self.matrix.shape[0]
+
+    def _column_sums(self, matrix: sparse.csr_matrix) -> np.ndarray:
+        # Every stored entry is a 1, so a column sum is a count of its indices
+        return np.bincount(matrix.indices, minlength=len(self.vocabulary))
+
+    def counts(self, rows=None) -> np.ndarray:
+        """Selections per option, over all rows or only the given row indices"""
+        if rows is None:
+            return self._counts
+        return self._column_sums(self.matrix[rows])
+
+    def total(self, rows=None) -> int:
+        """Total number of selections (a respondent can count more than once)"""
+        return int(self.counts(rows).sum())
+
+    def value_counts(self, rows=None, top: int | None = None) -> pd.DataFrame:
+        """Options and their counts, most frequent first, dropping unselected options"""
+        counts = self.counts(rows)
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        if top is not None:
+            order = order[:top]
+        return pd.DataFrame({"Option": self.vocabulary[order], "Count": counts[order]})
+
+    @classmethod
+    def from_codes(cls, name: str, codes: np.ndarray, values, sep: str = ";") -> "MultiSelectColumn":
+        """Build from per-row codes into `values` (the distinct answers, -1 for missing).
+
+        Each distinct answer string is split only once; rows are then expanded
+        by indexing into the parsed answers.
+        """
+        parts = pd.Series(list(values), dtype=object).str.split(sep).explode().str.strip()
+        parts = parts[parts.notna() & (parts != "")]
+        option_codes, vocabulary = pd.factorize(parts)
+
+        # One extra, empty row stands for missing answers
+        empty_row = len(values)
+        distinct = sparse.csr_matrix(
+            (np.ones(len(parts), dtype=np.uint8), (parts.index.to_numpy(), option_codes)),
+            shape=(empty_row + 1, len(vocabulary)),
+        )
+        distinct.sum_duplicates()
+        distinct.data[:] = 1
+
+        codes = np.where(codes < 0, empty_row, codes)
+        return cls(name, distinct[codes], np.asarray(vocabulary, dtype=object))
+
+    @classmethod
+    def from_series(cls, series: pd.Series, sep: str = ";") -> "MultiSelectColumn":
+        codes, uniques = pd.factorize(series)
+        return cls.from_codes(series.name, codes, uniques, sep=sep)
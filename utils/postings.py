@@ -0,0 +1,122 @@
+import operator
+from functools import reduce
+
+import numpy as np
+
+from utils.multiselect import MultiSelectColumn
+
+
+class Bitmap:
+    """A set of row ids packed into 64-bit words (bit k of word w is row 64*w + k).
+
+    Set operations are word-wise NumPy ops and counts are popcounts, so a
+    query costs a few microseconds per operand whatever the answers contain.
+    """
+
+    __slots__ = ("words", "n_rows")
+
+    def __init__(self, words: np.ndarray, n_rows: int):
+        self.words = words
+        self.n_rows = n_rows
+
+    @staticmethod
+    def n_words(n_rows: int) -> int:
+        return (n_rows + 63) // 64
+
+    @classmethod
+    def empty(cls, n_rows: int) -> "Bitmap":
+        return cls(np.zeros(cls.n_words(n_rows), dtype="<u8"), n_rows)
+
+    @classmethod
+    def full(cls, n_rows: int) -> "Bitmap":
+        return ~cls.empty(n_rows)
+
+    @classmethod
+    def from_rows(cls, rows, n_rows: int) -> "Bitmap":
+        mask = np.zeros(cls.n_words(n_rows) * 64, dtype=bool)
+        mask[rows] = True
+        return cls(np.packbits(mask, bitorder="little").view("<u8"), n_rows)
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.words & other.words, self.n_rows)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.words | other.words, self.n_rows)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.words & ~other.words, self.n_rows)
+
+    def __invert__(self) -> "Bitmap":
+        words = ~self.words
+        # Padding bits past the last row must stay clear
+        padding = len(words) * 64 - self.n_rows
+        if padding:
+            words[-1] &= np.uint64((1 << (64 - padding)) - 1)
+        return Bitmap(words, self.n_rows)
+
+    def count(self) -> int:
+        return int(np.bitwise_count(self.words).sum())
+
+    def rows(self) -> np.ndarray:
+        """Sorted row ids in the set"""
+        bits = np.unpackbits(self.words.view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits[:self.n_rows])
+
+
+class PostingList:
+    """Inverted index of a multi-select column: one Bitmap of respondents per option"""
+
+    def __init__(self, name: str, words: np.ndarray, vocabulary: np.ndarray, n_rows: int):
+        self.name = name
+        self.words = words
+        self.vocabulary = vocabulary
+        self.n_rows = n_rows
+        self._positions = {option: i for i, option in enumerate(vocabulary)}
+
+    def __contains__(self, option: str) -> bool:
+        return option in self._positions
+
+    def __getitem__(self, option: str) -> Bitmap:
+        """Respondents who selected `option` (empty if nobody did)"""
+        position = self._positions.get(option)
+        if position is None:
+            return Bitmap.empty(self.n_rows)
+        return Bitmap(self.words[position], self.n_rows)
+
+    def all_of(self, options) -> Bitmap:
+        return reduce(operator.and_, (self[o] for o in options), Bitmap.full(self.n_rows))
+
+    def any_of(self, options) -> Bitmap:
+        return reduce(operator.or_, (self[o] for o in options), Bitmap.empty(self.n_rows))
+
+    def counts(self) -> np.ndarray:
+        """Respondents per option, in vocabulary order"""
+        return np.bitwise_count(self.words).sum(axis=1)
+
+    @classmethod
+    def from_multiselect(cls, column: MultiSelectColumn) -> "PostingList":
+        n_rows = column.n_rows
+        by_option = column.matrix.tocsc()
+        words = np.zeros((len(column.vocabulary), Bitmap.n_words(n_rows)), dtype="<u8")
+        for j in range(len(column.vocabulary)):
+            rows = by_option.indices[by_option.indptr[j]:by_option.indptr[j + 1]]
+            words[j] = Bitmap.from_rows(rows, n_rows).words
+        return cls(column.name, words, column.vocabulary, n_rows)
+
+
+def query(dataset, all_of=(), any_of=(), none_of=()) -> Bitmap:
+    """Respondents matching a set-containment query over multi-select columns.
+
+    Each argument is a list of (column, option) pairs: the result keeps rows
+    that selected every `all_of` option, at least one `any_of` option (if
+    given) and none of the `none_of` options. `dataset` is a SurveyDataset,
+    so the same query runs in the app and in offline scripts.
+    """
+    result = Bitmap.full(dataset.n_rows)
+    for column, option in all_of:
+        result = result & dataset.postings(column)[option]
+    if any_of:
+        result = result & reduce(operator.or_, (dataset.postings(c)[o] for c, o in any_of))
+    for column, option in none_of:
+        result = result - dataset.postings(column)[option]
+    return result
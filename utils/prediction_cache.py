@@ -0,0 +1,144 @@
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import streamlit as st
+
+from utils.data import file_signature
+
+
+CACHE_PATH = Path(".cache/predictions.sqlite")
+MEMORY_ENTRIES = 2048
+
+
+def profile_key(profile: dict) -> str:
+    """Canonical key for a profile: sorted fields, lists sorted, numbers as floats"""
+    def canonical(value):
+        if isinstance(value, (list, tuple, set)):
+            return sorted(canonical(v) for v in value)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        return value
+    return json.dumps({k: canonical(v) for k, v in profile.items()}, sort_keys=True)
+
+
+def artifact_hash(paths) -> str:
+    """SHA-1 over the contents of the model files, in order (missing optional files count as empty)"""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(str(path).encode())
+        if not Path(path).exists():
+            continue
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """Model outputs keyed by profile: an in-process LRU in front of a SQLite table.
+
+    Entries are stored under `namespace` and the hash of the model files, so
+    retraining or replacing a model invalidates its entries, which are
+    dropped when the cache opens. The SQLite file outlives the process.
+    """
+
+    def __init__(self, namespace: str, model_hash: str, path: Path = CACHE_PATH,
+                 memory_entries: int = MEMORY_ENTRIES):
+        self.namespace = namespace
+        self.model_hash = model_hash
+        self.path = path
+        self.memory_entries = memory_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, object] = OrderedDict()
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                " namespace TEXT, model_hash TEXT, key TEXT, value BLOB,"
+                " PRIMARY KEY (namespace, model_hash, key))"
+            )
+            self._db.execute(
+                "DELETE FROM predictions WHERE namespace = ? AND model_hash != ?",
+                (namespace, model_hash),
+            )
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def _remember(self, key: str, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        """Cached value for key, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+            row = self._db.execute(
+                "SELECT value FROM predictions WHERE namespace = ? AND model_hash = ? AND key = ?",
+                (self.namespace, self.model_hash, key),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value = pickle.loads(row[0])
+            self._remember(key, value)
+            self.disk_hits += 1
+            return value
+
+    def put(self, key: str, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, value)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                    (self.namespace, self.model_hash, key, blob),
+                )
+
+    def get_or_compute(self, profile: dict, compute):
+        """Value for the profile, calling compute() only on a miss"""
+        key = profile_key(profile)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+
+# One live instance per namespace (three today); the ones opened for
+# replaced model files are evicted instead of keeping their connections
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _open_cache(namespace: str, signatures, paths) -> PredictionCache:
+    # `signatures` ties the instance (and its hash) to the current model files
+    return PredictionCache(namespace, artifact_hash(paths))
+
+
+def get_prediction_cache(namespace: str, paths) -> PredictionCache:
+    """Process-wide cache for the model stored in `paths`"""
+    paths = tuple(str(p) for p in paths)
+    return _open_cache(namespace, tuple(file_signature(Path(p)) for p in paths), paths)
+
+
+def show_cache_stats(cache: PredictionCache):
+    """Sidebar hit/miss counters"""
+    with st.sidebar:
+        st.markdown("**⚡ Prediction cache**")
+        c1, c2 = st.columns(2)
+        c1.metric("Hits", f"{cache.hits:,}", help=f"{cache.memory_hits:,} from memory, {cache.disk_hits:,} from disk")
+        c2.metric("Misses", f"{cache.misses:,}")
@@ -0,0 +1,50 @@
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+# Largest upload scored in the app; the scored CSV is kept in memory for the download
+MAX_UPLOAD_ROWS = 200_000
+
+
+def label_key(text: str) -> str:
+    """Loose key for matching answers to feature columns ("C#" and "csharp",
+    "Developer, back-end" and "developer__back_end" compare equal)"""
+    text = str(text).lower().replace("#", "sharp").replace("+", "plus")
+    return re.sub(r"[^a-z0-9]", "", text)
+
+
+def read_profiles(file, name: str, required_columns, max_rows: int = MAX_UPLOAD_ROWS) -> pd.DataFrame:
+    """Read a CSV or Parquet upload of at most `max_rows` profiles and check it has `required_columns`"""
+    if Path(name).suffix.lower() == ".parquet":
+        n_rows = pq.ParquetFile(file).metadata.num_rows
+        file.seek(0)
+        profiles = pd.read_parquet(file) if n_rows <= max_rows else None
+    else:
+        # One row past the limit is enough to tell the file is too long
+        profiles = pd.read_csv(file, nrows=max_rows + 1)
+        n_rows = len(profiles)
+    if n_rows > max_rows:
+        raise ValueError(f"The file has more than {max_rows:,} profiles; split it into smaller files")
+    missing = [c for c in required_columns if c not in profiles.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return profiles
+
+
+def flag_rows(errors: np.ndarray, bad: np.ndarray, values: pd.Series, message: str) -> None:
+    """Add `message`, formatted with the row's value, to `errors` for every row flagged in `bad`"""
+    for row, value in zip(np.flatnonzero(bad), values.to_numpy()[bad]):
+        text = message.format(value)
+        errors[row] = f"{errors[row]}; {text}" if errors[row] else text
+
+
+def flag_non_numbers(errors: np.ndarray, profiles: pd.DataFrame, columns) -> None:
+    """Flag the rows whose value in one of `columns` is given but is not a number"""
+    for column in columns:
+        values = profiles[column]
+        bad = (pd.to_numeric(values, errors="coerce").isna() & values.notna()).to_numpy()
+        flag_rows(errors, bad, values, f"{column} {{!r}} is not a number")
@@ -0,0 +1,347 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from utils.profiles import flag_non_numbers, flag_rows, label_key
+
+
+LANGUAGE_PREFIX = "Language_"
+AI_TOOL_PREFIX = "AISearchDevHave_"
+THRESHOLD = 0.5
+TOP_K = 5
+
+# Profile fields of the form, as the model saw them in training
+CATEGORICAL_INPUTS = ["Region", "EdLevel", "RemoteWork", "MainBranch_simple"]
+NUMERIC_INPUTS = ["Age", "YearsCode", "WorkExp"]
+# Columns of a batch upload, one role per row
+PROFILE_COLUMNS = NUMERIC_INPUTS + CATEGORICAL_INPUTS + ["DevType"]
+CHUNK_ROWS = 20_000
+# Typographic apostrophes typed or pasted instead of the straight one (and vice versa in the survey labels)
+APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "ʼ": "'", "`": "'"})
+
+# Display names for technologies whose title-cased column name reads badly
+DISPLAY_NAMES = {
+    'Javascript': 'JavaScript',
+    'Typescript': 'TypeScript',
+    'Nodejs': 'Node.js',
+    'Reactjs': 'React.js',
+    'Vuejs': 'Vue.js',
+    'Angularjs': 'Angular.js',
+    'Mysql': 'MySQL',
+    'Postgresql': 'PostgreSQL',
+    'Mongodb': 'MongoDB',
+    'Redis': 'Redis',
+    'Html Css': 'HTML/CSS',
+    'Assembly': 'Assembly',
+    'Bash Shell': 'Bash/Shell',
+    'Powershell': 'PowerShell',
+}
+
+
+def normalize_category(value) -> str:
+    """Category as compared with the fitted ones: straight apostrophes, single spaces, no padding"""
+    return " ".join(str(value).translate(APOSTROPHES).split())
+
+
+def display_name(column: str) -> str:
+    """Readable technology name for an output column"""
+    name = column.replace(LANGUAGE_PREFIX, "").replace(AI_TOOL_PREFIX, "").replace("_", " ").title()
+    name = name.replace("/", " ").strip()
+    for old, new in DISPLAY_NAMES.items():
+        if old.lower() in name.lower():
+            return new
+    return name
+
+
+def positive_probabilities(model, features) -> np.ndarray:
+    """(rows, outputs) probability of each label, from a single forward pass.
+
+    Accepts a multilabel MLPClassifier, whose predict_proba is already that
+    matrix, and a MultiOutputClassifier, whose predict_proba is one
+    (rows, classes) array per output; the column of class 1 is taken from
+    each (all zeros for an output that never saw a positive in training).
+    Models without predict_proba score their hard labels as 0 or 1.
+    """
+    if not hasattr(model, "predict_proba"):
+        return np.asarray(model.predict(features), dtype=float)
+    proba = model.predict_proba(features)
+    if isinstance(proba, np.ndarray):
+        return proba
+    columns = []
+    for p, classes in zip(proba, model.classes_):
+        classes = list(classes)
+        columns.append(p[:, classes.index(1)] if 1 in classes else np.zeros(len(p)))
+    return np.column_stack(columns)
+
+
+class OutputLayout:
+    """Which recommender outputs are languages and which are AI tools, and their display names.
+
+    Built once per model so splitting and ranking a probability row is a
+    couple of masks and an argsort.
+    """
+
+    def __init__(self, output_cols):
+        self.output_cols = list(output_cols)
+        self.names = np.array([display_name(c) for c in self.output_cols], dtype=object)
+        self.is_language = np.array([c.startswith(LANGUAGE_PREFIX) for c in self.output_cols])
+        self.is_ai_tool = np.array([c.startswith(AI_TOOL_PREFIX) for c in self.output_cols])
+
+    def ranked(self, proba: np.ndarray, mask: np.ndarray, threshold: float = THRESHOLD) -> list[tuple[str, float]]:
+        """(name, probability) of the outputs in `mask` above the threshold, most likely first"""
+        selected = np.flatnonzero(mask & (proba > threshold))
+        selected = selected[np.argsort(-proba[selected], kind="stable")]
+        # Several columns can share a display name; keep the likeliest
+        _, first = np.unique(self.names[selected].astype(str), return_index=True)
+        selected = selected[np.sort(first)]
+        return list(zip(self.names[selected].tolist(), proba[selected].tolist()))
+
+    def split(self, proba: np.ndarray, threshold: float = THRESHOLD):
+        """Recommended languages and AI tools for one probability row, each ranked"""
+        return self.ranked(proba, self.is_language, threshold), self.ranked(proba, self.is_ai_tool, threshold)
+
+
+def role_profiles(profile: dict, roles) -> pd.DataFrame:
+    """One copy of `profile` per role, for scoring every role in one batch"""
+    roles = list(roles)
+    return pd.DataFrame([profile] * len(roles)).assign(DevType=roles)
+
+
+def random_profiles(transformer: "InputTransformer", n_rows: int, seed: int) -> pd.DataFrame:
+    """Random form profiles over the categories and roles the preprocessing was fitted on"""
+    rng = np.random.default_rng(seed)
+    years_code = rng.integers(0, 45, n_rows)
+    profiles = pd.DataFrame({
+        "Age": rng.integers(18, 71, n_rows),
+        "YearsCode": years_code,
+        "WorkExp": rng.integers(0, years_code + 1),
+        "DevType": rng.choice(transformer.roles, n_rows),
+    })
+    for column, categories in transformer.categories.items():
+        profiles[column] = rng.choice(categories.to_numpy(), n_rows)
+    return profiles
+
+
+def devtype_column(role: str) -> str:
+    """Input column of a DevType answer, named as in training"""
+    name = role.lower().replace(' ', '_').replace('-', '_').replace('(', '').replace(')', '').replace('.', '')
+    return f"DevType_{name}"
+
+
+class InputTransformer:
+    """Form values to model-ready float32 rows, compiled once from the fitted preprocessing.
+
+    Holds the position of every input column, a category-to-ordinal
+    lookup per encoded column and the scaler folded into one multiply-add,
+    so a profile becomes a row without building DataFrames or calling
+    encoder.transform / scaler.transform. Its state is plain arrays
+    (see arrays / from_arrays), so it can be stored next to the NumPy
+    export of the model and used without scikit-learn.
+    """
+
+    def __init__(self, input_cols, categories: dict, roles, weight: np.ndarray, offset: np.ndarray,
+                 unknown_code: float | None = None):
+        self.input_cols = list(input_cols)
+        position = {c: i for i, c in enumerate(self.input_cols)}
+        self.numeric_positions = [(c, position[c]) for c in NUMERIC_INPUTS if c in position]
+        self.categories = {column: pd.Index(values) for column, values in categories.items()}
+        self.category_codes = {
+            column: {normalize_category(value): float(code) for code, value in enumerate(index)}
+            for column, index in self.categories.items()
+        }
+        self.categorical_positions = [(c, position[c]) for c in self.categories if c in position]
+        # OrdinalEncoder raises on unseen categories unless it was given a code for them
+        self.unknown_code = unknown_code
+        self.roles = list(roles)
+        # Form labels and survey spellings meet on label_key ("Developer  Back End" ~ "Developer, back-end")
+        self.role_positions = {label_key(role): position.get(devtype_column(role)) for role in self.roles}
+        self.weight = np.asarray(weight, dtype=np.float32)
+        self.offset = np.asarray(offset, dtype=np.float32)
+
+    @classmethod
+    def from_fitted(cls, encoder, scaler, input_cols, roles, use_scaled: bool) -> "InputTransformer":
+        """Compile the fitted OrdinalEncoder and StandardScaler of the recommender"""
+        input_cols = list(input_cols)
+        position = {c: i for i, c in enumerate(input_cols)}
+        n_inputs = len(input_cols)
+        weight = np.ones(n_inputs, dtype=np.float32)
+        offset = np.zeros(n_inputs, dtype=np.float32)
+        if scaler is not None and use_scaled:
+            order = [position[c] for c in getattr(scaler, "feature_names_in_", input_cols)]
+            mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_inputs)
+            scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_inputs)
+            # (x - mean) / scale == x * weight + offset
+            weight[order] = 1 / scale
+            offset[order] = -mean / scale
+        unknown_code = (
+            float(encoder.unknown_value) if getattr(encoder, "handle_unknown", "error") == "use_encoded_value" else None
+        )
+        categories = dict(zip(encoder.feature_names_in_, encoder.categories_))
+        return cls(input_cols, categories, roles, weight, offset, unknown_code)
+
+    def arrays(self, prefix: str = "") -> dict:
+        """The transformer as named arrays, for np.savez"""
+        return {
+            f"{prefix}input_cols": np.array(self.input_cols),
+            f"{prefix}roles": np.array(self.roles),
+            f"{prefix}weight": self.weight,
+            f"{prefix}offset": self.offset,
+            f"{prefix}unknown_code": np.array(np.nan if self.unknown_code is None else self.unknown_code),
+            f"{prefix}categorical_columns": np.array(list(self.categories)),
+            **{f"{prefix}categories_{i}": index.to_numpy(dtype=str) for i, index in enumerate(self.categories.values())},
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str = "") -> "InputTransformer":
+        columns = arrays[f"{prefix}categorical_columns"].tolist()
+        unknown_code = float(arrays[f"{prefix}unknown_code"])
+        return cls(
+            arrays[f"{prefix}input_cols"].tolist(),
+            {column: arrays[f"{prefix}categories_{i}"].tolist() for i, column in enumerate(columns)},
+            arrays[f"{prefix}roles"].tolist(),
+            arrays[f"{prefix}weight"],
+            arrays[f"{prefix}offset"],
+            None if np.isnan(unknown_code) else unknown_code,
+        )
+
+    def _code(self, column: str, value) -> float:
+        code = self.category_codes[column].get(normalize_category(value), self.unknown_code)
+        if code is None:
+            raise ValueError(f"Found unknown category {value!r} in column {column}")
+        return code
+
+    def transform_one(self, profile: dict) -> np.ndarray:
+        """(1, inputs) float32 row for one profile as entered in the form"""
+        row = np.zeros(len(self.input_cols), dtype=np.float32)
+        for column, i in self.numeric_positions:
+            row[i] = profile[column]
+        for column, i in self.categorical_positions:
+            row[i] = self._code(column, profile[column])
+        role = self.role_positions.get(label_key(profile["DevType"]))
+        if role is not None:
+            row[role] = 1
+        row *= self.weight
+        row += self.offset
+        return row[np.newaxis, :]
+
+    def _codes(self, column: str, values: pd.Series) -> np.ndarray:
+        """Ordinal code of each value, -1 where it is not a fitted category (compared normalized)"""
+        codes, uniques = pd.factorize(values)
+        lookup = self.category_codes[column]
+        # Only the distinct values are normalized; missing values (code -1) land on the trailing -1
+        return np.array([lookup.get(normalize_category(u), -1) for u in uniques] + [-1], dtype=np.float32)[codes]
+
+    def row_errors(self, profiles: pd.DataFrame) -> np.ndarray:
+        """Why each profile cannot be transformed, "" for the ones that can"""
+        errors = np.full(len(profiles), "", dtype=object)
+        flag_non_numbers(errors, profiles, [column for column, _ in self.numeric_positions])
+        if self.unknown_code is None:
+            for column, _ in self.categorical_positions:
+                bad = self._codes(column, profiles[column]) < 0
+                flag_rows(errors, bad, profiles[column], f"unknown {column} {{!r}}")
+        role_codes, roles = pd.factorize(profiles["DevType"])
+        known = np.array([label_key(r) in self.role_positions for r in roles] + [False])[role_codes]
+        flag_rows(errors, ~known, profiles["DevType"], "unknown DevType {!r}")
+        return errors
+
+    def transform(self, profiles: pd.DataFrame) -> np.ndarray:
+        """(rows, inputs) float32 matrix for a frame of profiles, in one vectorized pass"""
+        rows = np.zeros((len(profiles), len(self.input_cols)), dtype=np.float32)
+        for column, i in self.numeric_positions:
+            rows[:, i] = pd.to_numeric(profiles[column], errors="coerce").fillna(0).to_numpy()
+        for column, i in self.categorical_positions:
+            codes = self._codes(column, profiles[column])
+            unknown = codes < 0
+            if unknown.any():
+                if self.unknown_code is None:
+                    value = profiles[column].to_numpy()[np.flatnonzero(unknown)[0]]
+                    raise ValueError(f"Found unknown category {value!r} in column {column}")
+                codes[unknown] = self.unknown_code
+            rows[:, i] = codes
+        role_codes, roles = pd.factorize(profiles["DevType"])
+        targets = np.array([
+            -1 if (p := self.role_positions.get(label_key(r))) is None else p for r in roles
+        ] + [-1], dtype=int)[role_codes]
+        matched = np.flatnonzero(targets >= 0)
+        rows[matched, targets[matched]] = 1
+        rows *= self.weight
+        rows += self.offset
+        return rows
+
+
+def _top_names(proba: np.ndarray, columns: np.ndarray, names: np.ndarray, top_k: int,
+               threshold: float) -> list[str]:
+    """';'-joined names of each row's top_k recommended outputs among `columns`, likeliest first"""
+    sub = proba[:, columns]
+    k = min(top_k, len(columns))
+    if k == 0:
+        return [""] * len(proba)
+    best = np.argpartition(-sub, k - 1, axis=1)[:, :k]
+    best = np.take_along_axis(best, np.argsort(-np.take_along_axis(sub, best, axis=1), axis=1), axis=1)
+    recommended = np.take_along_axis(sub, best, axis=1) > threshold
+    labels = names[columns][best]
+    # Columns sharing a display name appear once
+    return [";".join(dict.fromkeys(row[keep])) for row, keep in zip(labels, recommended)]
+
+
+class CohortRecommendations:
+    """Recommendations for a file of profiles, scored chunk by chunk.
+
+    score() yields each chunk with its top-k languages and AI tools and
+    adds the chunk to running per-technology totals, so memory stays
+    bounded by the chunk size however long the file is. Profiles that
+    cannot be scored (unknown categories or roles, non-numeric values) are kept
+    with empty recommendations and the reason in an Error column, and
+    counted in `skipped` / `errors` instead of failing the file.
+    """
+
+    def __init__(self, model, transformer: InputTransformer, layout: OutputLayout, top_k: int = TOP_K,
+                 threshold: float = THRESHOLD):
+        self.model = model
+        self.transformer = transformer
+        self.layout = layout
+        self.top_k = top_k
+        self.threshold = threshold
+        self.rows = 0
+        self.skipped = 0
+        self.errors = Counter()
+        self.recommended = np.zeros(len(layout.output_cols), dtype=np.int64)
+        self.probability_sum = np.zeros(len(layout.output_cols))
+        self._languages = np.flatnonzero(layout.is_language)
+        self._ai_tools = np.flatnonzero(layout.is_ai_tool)
+
+    def score(self, profiles: pd.DataFrame, chunk_rows: int = CHUNK_ROWS):
+        """Yield each chunk of `profiles` with TopLanguages and TopAITools columns added"""
+        names = self.layout.names.astype(str)
+        for start in range(0, len(profiles), chunk_rows):
+            chunk = profiles.iloc[start:start + chunk_rows]
+            errors = self.transformer.row_errors(chunk)
+            valid = errors == ""
+            languages = np.full(len(chunk), "", dtype=object)
+            ai_tools = np.full(len(chunk), "", dtype=object)
+            if valid.any():
+                proba = positive_probabilities(self.model, self.transformer.transform(chunk[valid]))
+                self.recommended += (proba > self.threshold).sum(axis=0)
+                self.probability_sum += proba.sum(axis=0, dtype=np.float64)
+                languages[valid] = _top_names(proba, self._languages, names, self.top_k, self.threshold)
+                ai_tools[valid] = _top_names(proba, self._ai_tools, names, self.top_k, self.threshold)
+            self.rows += int(valid.sum())
+            self.skipped += int((~valid).sum())
+            self.errors.update(errors[~valid])
+            yield chunk.assign(TopLanguages=languages, TopAITools=ai_tools, Error=errors)
+
+    def totals(self) -> pd.DataFrame:
+        """Per technology: how many profiles it is recommended to, and its mean probability"""
+        totals = pd.DataFrame({
+            "Technology": self.layout.names.astype(str),
+            "Kind": np.where(self.layout.is_language, "Language", np.where(self.layout.is_ai_tool, "AI tool", "Other")),
+            "Profiles": self.recommended,
+            "Mean probability": self.probability_sum / max(self.rows, 1),
+        })
+        # Columns sharing a display name are merged, keeping the larger figures
+        totals = totals.groupby(["Technology", "Kind"], as_index=False).agg(
+            {"Profiles": "max", "Mean probability": "max"}
+        )
+        totals["Share %"] = 100 * totals["Profiles"] / max(self.rows, 1)
+        return totals.sort_values("Profiles", ascending=False, ignore_index=True)
@@ -0,0 +1,279 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+from catboost import Pool
+from scipy import sparse
+
+from utils.multiselect import MultiSelectColumn
+from utils.profiles import flag_non_numbers, flag_rows, label_key
+
+
+ED_MAP = {
+    "Primary/elementary school": 0,
+    "Secondary school (e.g. American high school, German Realschule or Gymnasium, etc.)": 1,
+    "Some college/university study without earning a degree": 2,
+    "Associate degree (A.A., A.S., etc.)": 3,
+    "Bachelor's degree (B.A., B.S., B.Eng., etc.)": 4,
+    "Master's degree (M.A., M.S., M.Eng., MBA, etc.)": 5,
+    "Professional degree (JD, MD, Ph.D, Ed.D, etc.)": 6,
+    "Something else": 7,
+}
+
+# Form options, also the known categories of the model's categorical features
+EDLEVELS = [
+    "Primary/elementary school",
+    "Secondary school (e.g. American high school, German Realschule or Gymnasium, etc.)",
+    "Some college/university study without earning a degree",
+    "Associate degree (A.A., A.S., etc.)",
+    "Bachelor's degree (B.A., B.S., B.Eng., etc.)",
+    "Master's degree (M.A., M.S., M.Eng., MBA, etc.)",
+    "Professional degree (JD, MD, Ph.D, Ed.D, etc.)",
+    "Something else",
+]
+AGES = [
+    "Under 18 years old", "18-24 years old", "25-34 years old",
+    "35-44 years old", "45-54 years old", "55-64 years old",
+    "65 years or older", "Unknown",
+]
+REGIONS = [
+    'Northern America', 'Western Europe', 'Eastern Europe', 'Northern Europe',
+    'Southern Europe', 'Southern Asia', 'South-eastern Asia', 'Eastern Asia',
+    'Central Asia', 'South America', 'Central America', 'Caribbean',
+    'Northern Africa', 'Western Africa', 'Middle Africa', 'Eastern Africa',
+    'Southern Africa', 'Australia and New Zealand', 'Melanesia', 'Polynesia',
+    'Other',
+]
+
+# Columns of a batch upload; Languages is ';'-separated like the survey answers
+PROFILE_COLUMNS = ["Age", "Region", "EdLevel", "YearsCode", "WorkExp", "DevType", "Languages"]
+REQUIRED_PROFILE_COLUMNS = ["Age", "Region", "EdLevel", "YearsCode", "WorkExp", "DevType"]
+
+CHUNK_ROWS = 50_000
+
+
+class SalaryEncoder:
+    """Maps profiles onto the salary model's feature layout.
+
+    Built once from the model metadata: column positions, the answer-to-
+    column lookups and an all-zero row template are precomputed, so
+    encoding does no per-column Python work whether it gets one profile
+    (encode_one) or a whole file (encode).
+    """
+
+    def __init__(self, meta: dict):
+        self.feature_columns = list(meta["feature_columns"])
+        # EdLevel is passed as text next to EdLevel_ord, as in training
+        self.categorical_columns = meta["categorical_features"] + ["EdLevel"]
+        self.columns = self.feature_columns + ["EdLevel"]
+        self.cat_idx = [self.columns.index(c) for c in self.categorical_columns]
+
+        # Numeric features live in one float block; categoricals are slotted in afterwards
+        self.numeric_columns = [c for c in self.columns if c not in self.categorical_columns]
+        position = {c: i for i, c in enumerate(self.numeric_columns)}
+        self._years_code = position["YearsCode"]
+        self._work_exp = position["WorkExp"]
+        self._languages_count = position["languages_count"]
+        self._years_prof_ratio = position["years_prof_ratio"]
+        self._coding_gap_years = position["coding_gap_years"]
+        self._ed_level_ord = position["EdLevel_ord"]
+        self._categorical_inserts = sorted((self.columns.index(c), c) for c in self.categorical_columns)
+
+        self.language_columns = [c for c in self.numeric_columns if c.startswith("Language_")]
+        self.devtype_columns = [c for c in self.numeric_columns if c.startswith("DevType_")]
+        self._language_positions = np.array([position[c] for c in self.language_columns])
+        self.language_lookup = {label_key(c.removeprefix("Language_")): position[c] for c in self.language_columns}
+        self.devtype_lookup = {label_key(c.removeprefix("DevType_")): position[c] for c in self.devtype_columns}
+        # Languages the model has no column for were grouped as "other" in training
+        self._other_language = self.language_lookup.get("other")
+
+        self.template = np.zeros(len(self.numeric_columns))
+
+    def language_position(self, label: str) -> int | None:
+        return self.language_lookup.get(label_key(label), self._other_language)
+
+    def devtype_position(self, label: str) -> int | None:
+        return self.devtype_lookup.get(label_key(label))
+
+    def _assemble(self, numeric: np.ndarray, years_code, work_exp, ed_level, categoricals: dict) -> pd.DataFrame:
+        numeric[:, self._years_code] = years_code
+        numeric[:, self._work_exp] = work_exp
+        numeric[:, self._languages_count] = numeric[:, self._language_positions].sum(axis=1)
+        numeric[:, self._years_prof_ratio] = work_exp / np.maximum(years_code, 1e-6)
+        numeric[:, self._coding_gap_years] = np.maximum(years_code - work_exp, 0)
+        numeric[:, self._ed_level_ord] = ed_level
+
+        features = pd.DataFrame(numeric, columns=self.numeric_columns, copy=False)
+        for position, column in self._categorical_inserts:
+            features.insert(position, column, categoricals[column])
+        return features
+
+    def encode_one(self, age: str, region: str, ed_level: str, years_code: float, work_exp: float,
+                   devtype: str, languages=()) -> pd.DataFrame:
+        """Feature row for a single profile, as entered in the form"""
+        numeric = self.template.copy()[np.newaxis, :]
+        for label in languages:
+            position = self.language_position(label)
+            if position is not None:
+                numeric[0, position] = 1
+        position = self.devtype_position(devtype)
+        if position is not None:
+            numeric[0, position] = 1
+        return self._assemble(
+            numeric, float(years_code), float(work_exp), float(ED_MAP.get(ed_level, 7)),
+            {"Region": [region], "Age": [age], "EdLevel": [ed_level]},
+        )
+
+    def encode(self, profiles: pd.DataFrame) -> pd.DataFrame:
+        """Feature rows for a frame of profiles (see PROFILE_COLUMNS), in one vectorized pass"""
+        n_rows = len(profiles)
+        numeric = np.zeros((n_rows, len(self.numeric_columns)))
+
+        # Languages: multi-hot over the distinct answers, then folded onto the model's columns
+        if "Languages" in profiles.columns:
+            answers = MultiSelectColumn.from_series(profiles["Languages"].fillna("").astype(str))
+            targets = np.array([
+                -1 if (p := self.language_position(v)) is None else p for v in answers.vocabulary
+            ], dtype=int)
+            known = np.flatnonzero(targets >= 0)
+            folding = sparse.csr_matrix(
+                (np.ones(len(known)), (known, targets[known])),
+                shape=(len(answers.vocabulary), len(self.numeric_columns)),
+            )
+            numeric += ((answers.matrix @ folding).toarray() > 0)
+
+        # DevType: one role per row; the trailing -1 catches missing roles
+        role_codes, roles = pd.factorize(profiles["DevType"])
+        targets = np.array([
+            -1 if (p := self.devtype_position(r)) is None else p for r in roles
+        ] + [-1], dtype=int)[role_codes]
+        matched = np.flatnonzero(targets >= 0)
+        numeric[matched, targets[matched]] = 1
+
+        years_code = pd.to_numeric(profiles["YearsCode"], errors="coerce").fillna(0).to_numpy(dtype=float)
+        work_exp = pd.to_numeric(profiles["WorkExp"], errors="coerce").fillna(0).to_numpy(dtype=float)
+        ed_level = profiles["EdLevel"].astype(str)
+        return self._assemble(
+            numeric, years_code, work_exp, ed_level.map(ED_MAP).fillna(7).to_numpy(dtype=float),
+            {
+                "Region": profiles["Region"].astype(str).to_numpy(),
+                "Age": profiles["Age"].astype(str).to_numpy(),
+                "EdLevel": ed_level.to_numpy(),
+            },
+        )
+
+    def row_errors(self, profiles: pd.DataFrame) -> np.ndarray:
+        """Why each profile cannot be scored, "" for the ones that can"""
+        errors = np.full(len(profiles), "", dtype=object)
+        flag_non_numbers(errors, profiles, ["YearsCode", "WorkExp"])
+        role_codes, roles = pd.factorize(profiles["DevType"])
+        known = np.array([self.devtype_position(r) is not None for r in roles] + [False])[role_codes]
+        flag_rows(errors, ~known, profiles["DevType"], "unknown DevType {!r}")
+        return errors
+
+    def pool(self, features: pd.DataFrame) -> Pool:
+        return Pool(features, cat_features=self.cat_idx)
+
+
+def predict_salaries(model, encoder: SalaryEncoder, profiles: pd.DataFrame) -> np.ndarray:
+    """Annual salary estimates (USD) for a batch of profiles, with one Pool"""
+    pred_log = model.predict(encoder.pool(encoder.encode(profiles)))
+    return np.expm1(pred_log)
+
+
+def random_profiles(encoder: SalaryEncoder, n_rows: int, seed: int) -> pd.DataFrame:
+    """Random profiles over the form's options"""
+    rng = np.random.default_rng(seed)
+    languages = [c.removeprefix("Language_") for c in encoder.language_columns]
+    roles = [c.removeprefix("DevType_") for c in encoder.devtype_columns]
+    years_code = rng.integers(0, 45, n_rows)
+    return pd.DataFrame({
+        "Age": rng.choice(AGES, n_rows),
+        "Region": rng.choice(REGIONS, n_rows),
+        "EdLevel": rng.choice(EDLEVELS, n_rows),
+        "YearsCode": years_code,
+        "WorkExp": rng.integers(0, years_code + 1),
+        "DevType": rng.choice(roles, n_rows),
+        "Languages": [
+            ";".join(rng.choice(languages, rng.integers(0, 6), replace=False)) for _ in range(n_rows)
+        ],
+    })
+
+
+def what_if_grid(profile: dict, axes: dict) -> pd.DataFrame:
+    """Copies of `profile` for every combination of the values in `axes`.
+
+    `profile` uses the PROFILE_COLUMNS fields (Languages may be a list);
+    `axes` maps one or more of those fields to the values to try. The grid
+    is meant to be scored in one call to predict_salaries.
+    """
+    grid = pd.DataFrame(list(itertools.product(*axes.values())), columns=list(axes))
+    for field, value in profile.items():
+        if field in axes:
+            continue
+        if field == "Languages" and not isinstance(value, str):
+            value = ";".join(value)
+        grid[field] = value
+    return grid
+
+
+def language_uplift(model, encoder: SalaryEncoder, profile: dict, candidates, max_added: int = 3,
+                    beam_width: int = 5) -> pd.DataFrame:
+    """Beam search for the 1..max_added languages that raise the estimate most.
+
+    Each step scores every (kept branch + one more language) set as one
+    batch, keeps the `beam_width` best branches and moves on. Candidates
+    the profile already has (or that have no column of their own) are
+    skipped. Returns every kept branch with its salary and uplift over the
+    profile as entered, best first.
+    """
+    known = list(profile.get("Languages") or [])
+    taken = {encoder.language_position(label) for label in known}
+    options = []
+    for label in candidates:
+        position = encoder.language_position(label)
+        if position is not None and position not in taken and label_key(label) in encoder.language_lookup:
+            taken.add(position)
+            options.append(label)
+
+    base = what_if_grid(profile, {"Languages": [";".join(known)]})
+    baseline = float(predict_salaries(model, encoder, base)[0])
+
+    beam = [()]
+    kept = []
+    for _ in range(max_added):
+        branches = list(dict.fromkeys(
+            tuple(sorted(branch + (label,))) for branch in beam for label in options if label not in branch
+        ))
+        if not branches:
+            break
+        grid = what_if_grid(profile, {"Languages": [";".join(known + list(b)) for b in branches]})
+        salaries = predict_salaries(model, encoder, grid)
+        order = np.argsort(-salaries)[:beam_width]
+        beam = [branches[i] for i in order]
+        kept.extend((branches[i], float(salaries[i])) for i in order)
+
+    result = pd.DataFrame({
+        "Add": [", ".join(branch) for branch, _ in kept],
+        "Languages added": [len(branch) for branch, _ in kept],
+        "Salary": [salary for _, salary in kept],
+    })
+    result["Uplift"] = result["Salary"] - baseline
+    result["Uplift %"] = 100 * result["Uplift"] / baseline
+    return result.sort_values("Uplift", ascending=False, ignore_index=True)
+
+
+def score_profiles(profiles: pd.DataFrame, model, encoder: SalaryEncoder, chunk_rows: int = CHUNK_ROWS):
+    """Yield (profiles chunk, salaries, errors) in input order, one CatBoost call per chunk.
+
+    Rows that cannot be scored (see SalaryEncoder.row_errors) are left out
+    of the call: their salary is NaN and their error says why.
+    """
+    for start in range(0, len(profiles), chunk_rows):
+        chunk = profiles.iloc[start:start + chunk_rows]
+        errors = encoder.row_errors(chunk)
+        valid = errors == ""
+        salaries = np.full(len(chunk), np.nan)
+        if valid.any():
+            salaries[valid] = predict_salaries(model, encoder, chunk[valid])
+        yield chunk, salaries, errors
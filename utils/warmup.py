@@ -0,0 +1,84 @@
+import threading
+import time
+
+import streamlit as st
+
+from utils.aggregates import get_aggregates
+from utils.data import get_survey, survey_source
+from utils.models import (
+    load_recommender_scorer, load_salary_explainer, load_salary_model, warm_recommender, warm_salary_model,
+)
+
+
+def _load_survey_if_present():
+    # Deployments that ship only the prebuilt aggregates have no dataset to load
+    if survey_source()[1] is not None:
+        get_survey()
+
+
+# (label, function) pairs, run in order. Each one fills a shared
+# st.cache_resource entry that the pages read later; they all have
+# show_spinner=False, as the thread belongs to no session.
+WARMUP_STEPS = [
+    ("survey data", _load_survey_if_present),
+    ("chart aggregates", get_aggregates),
+    ("salary model", load_salary_model),
+    ("recommendation models", load_recommender_scorer),
+    ("salary model warm-up", warm_salary_model),
+    ("recommendation warm-up", warm_recommender),
+    ("salary explanations", load_salary_explainer),
+]
+
+
+class WarmUp:
+    """Loads the app's shared resources in a background thread.
+
+    One instance exists per server process; pages find everything it
+    loaded already in their caches. A failing step is recorded and skipped,
+    so the page that needs it reports the error as it did before.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.completed: list[str] = []
+        self.errors: dict[str, str] = {}
+        self.current: str | None = None
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def progress(self) -> float:
+        return len(self.completed) / len(self.steps)
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at if self.started_at is not None else 0.0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def _run(self):
+        for label, step in self.steps:
+            self.current = label
+            try:
+                step()
+            except Exception as e:
+                self.errors[label] = str(e)
+            self.completed.append(label)
+        self.current = None
+        self.finished_at = time.perf_counter()
+
+
+@st.cache_resource(show_spinner=False)
+def get_warmup() -> WarmUp:
+    """The process-wide warm-up, started on first use"""
+    warmup = WarmUp(WARMUP_STEPS)
+    warmup.start()
+    return warmup